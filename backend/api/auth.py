@@ -50,7 +50,7 @@ async def verify_api_key(api_key: Optional[str] = Security(api_key_header)) -> s
         )
 
     # Validate API key
-    valid_keys = settings.api_keys_list
+    valid_keys = settings.api_keys_set
     if not valid_keys:
         # No keys configured - this is a configuration error
         raise HTTPException(
@@ -84,7 +84,7 @@ def get_optional_api_key(api_key: Optional[str] = Security(api_key_header)) -> O
     if not api_key:
         return None
 
-    if api_key in settings.api_keys_list:
+    if api_key in settings.api_keys_set:
         return api_key
 
     return None
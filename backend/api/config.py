@@ -5,8 +5,9 @@ This module centralizes all configuration using pydantic-settings for
 environment-based configuration with validation and type safety.
 """
 
+from functools import cached_property
 from pathlib import Path
-from typing import List
+from typing import FrozenSet, List
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -37,6 +38,7 @@ class Settings(BaseSettings):
     cors_allow_credentials: bool = Field(default=True, description="Allow credentials in CORS")
     cors_allow_methods: str = Field(default="*", description="Allowed HTTP methods")
     cors_allow_headers: str = Field(default="*", description="Allowed HTTP headers")
+    cors_max_age: int = Field(default=86400, ge=0, description="Seconds browsers may cache CORS preflight responses")
 
     # Security Configuration
     api_key_enabled: bool = Field(default=False, description="Enable API key authentication")
@@ -87,18 +89,23 @@ class Settings(BaseSettings):
             raise ValueError(f"Environment must be one of {allowed}")
         return v.lower()
 
-    @property
+    @cached_property
     def cors_origins_list(self) -> List[str]:
-        """Get CORS origins as a list."""
+        """Get CORS origins as a list, split once per Settings instance."""
         return [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
 
-    @property
+    @cached_property
     def api_keys_list(self) -> List[str]:
-        """Get API keys as a list."""
+        """Get API keys as a list, split once per Settings instance (checked on every authenticated request)."""
         if not self.api_keys:
             return []
         return [key.strip() for key in self.api_keys.split(",") if key.strip()]
 
+    @cached_property
+    def api_keys_set(self) -> FrozenSet[str]:
+        """Get API keys as a set, for O(1) lookup during authentication (not a timing-safe comparison)."""
+        return frozenset(self.api_keys_list)
+
     @property
     def risk_predictor_path(self) -> Path:
         """Get full path to risk predictor model."""
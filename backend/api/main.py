@@ -7,7 +7,10 @@ prediction and intervention recommendation using ML models.
 
 import logging
 from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import List, Tuple
 
+import numpy as np
 import pandas as pd
 from fastapi import Depends, FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
@@ -16,6 +19,8 @@ from fastapi.responses import JSONResponse
 from api.auth import verify_api_key
 from api.config import get_settings
 from api.models import (
+    BatchSimulationRequest,
+    BatchSimulationResponse,
     HealthCheckResponse,
     HealthStatus,
     PatientInput,
@@ -26,6 +31,7 @@ from api.models import (
 from api.rate_limit import RateLimitMiddleware
 from ml.intervention_utils import (
     apply_intervention_effects,
+    apply_intervention_effects_batch,
     ensure_risk_monotonicity,
     generate_intervention_explanation,
     get_modifiable_features,
@@ -37,6 +43,9 @@ from ml.risk_predictor import RiskPredictor
 risk_predictor: RiskPredictor = None
 # Scaler removed - Logistic Regression works with raw features
 
+# Number of (predictor, patient[, action]) results /api/simulate and /api/recommend each keep in memory
+SIMULATION_CACHE_SIZE = 1024
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -48,6 +57,10 @@ async def lifespan(app: FastAPI):
 
     settings = get_settings()
 
+    # Memoised simulations and recommendations belong to the previous model instance
+    simulate_cached.cache_clear()
+    recommend_cached.cache_clear()
+
     # Configure logging based on settings
     logging.basicConfig(level=getattr(logging, settings.log_level.upper()), format=settings.log_format)
     logger = logging.getLogger(__name__)
@@ -116,12 +129,30 @@ app.add_middleware(
     allow_credentials=settings.cors_allow_credentials,
     allow_methods=settings.cors_allow_methods.split(",") if settings.cors_allow_methods != "*" else ["*"],
     allow_headers=settings.cors_allow_headers.split(",") if settings.cors_allow_headers != "*" else ["*"],
+    max_age=settings.cors_max_age,
 )
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 
 
+def get_risk_predictor() -> RiskPredictor:
+    """
+    Provide the loaded risk predictor to endpoints.
+
+    FastAPI dependency so tests can substitute a model via app.dependency_overrides.
+
+    Returns:
+        The risk predictor loaded at startup
+
+    Raises:
+        HTTPException: 503 if the model has not been loaded
+    """
+    if risk_predictor is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Risk predictor model not loaded")
+    return risk_predictor
+
+
 def patient_to_dataframe(patient: PatientInput) -> pd.DataFrame:
     """
     Convert patient input to DataFrame for model inference.
@@ -138,6 +169,113 @@ def patient_to_dataframe(patient: PatientInput) -> pd.DataFrame:
     return patient_df
 
 
+def simulate_action(predictor: RiskPredictor, patient_df: pd.DataFrame, current_prediction: dict, action: int) -> HealthStatus:
+    """
+    Simulate a single intervention against a patient's baseline prediction.
+
+    Args:
+        predictor: Trained risk predictor used for the post-intervention prediction
+        patient_df: One-row DataFrame with raw patient features
+        current_prediction: Baseline prediction for patient_df from the risk predictor
+        action: Intervention action to simulate (0-4)
+
+    Returns:
+        HealthStatus with current vs. optimized metrics and risk reduction
+    """
+    # Monitor Only changes nothing, so the baseline prediction is the outcome
+    if action == 0:
+        return build_health_status(patient_df, patient_df, current_prediction, current_prediction["risk_score"], action)
+
+    # Apply intervention effects to raw values
+    # Using smart intervention logic with bounds checking
+    modified_df = apply_intervention_effects(patient_df.copy(), action)
+
+    # Get new risk from modified data (no scaling needed)
+    new_prediction = predictor.predict(modified_df)
+
+    return build_health_status(patient_df, modified_df, current_prediction, new_prediction["risk_score"], action)
+
+
+def predict_action_outcomes(
+    predictor: RiskPredictor, patient_df: pd.DataFrame, actions: List[int]
+) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Apply several interventions to one patient and score them all in one model call.
+
+    Args:
+        predictor: Trained risk predictor
+        patient_df: One-row DataFrame with raw patient features
+        actions: Intervention actions to apply (0-4)
+
+    Returns:
+        Tuple of (DataFrame with one row of post-intervention features per action,
+        array of predicted risks (%) for those rows), both in action order
+    """
+    # Copies keep the patient's index label, which seeds its deterministic exang outcome
+    modified_df = apply_intervention_effects_batch(pd.concat([patient_df] * len(actions)), actions)
+    return modified_df, predictor.predict_risk_scores(modified_df)
+
+
+def build_health_status(
+    patient_df: pd.DataFrame, modified_df: pd.DataFrame, current_prediction: dict, new_risk: float, action: int
+) -> HealthStatus:
+    """
+    Compare a patient with their post-intervention features.
+
+    Args:
+        patient_df: One-row DataFrame with raw patient features
+        modified_df: One-row DataFrame with the features after the intervention
+        current_prediction: Baseline prediction for patient_df from the risk predictor
+        new_risk: Predicted risk (%) for modified_df
+        action: Intervention action that produced modified_df (0-4)
+
+    Returns:
+        HealthStatus with current vs. optimized metrics and risk reduction
+    """
+    current_risk = current_prediction["risk_score"]
+
+    # Extract key metrics for comparison (RAW VALUES)
+    current_metrics = {
+        "trestbps": float(patient_df["trestbps"].iloc[0]),
+        "chol": float(patient_df["chol"].iloc[0]),
+        "thalach": float(patient_df["thalach"].iloc[0]),
+        "oldpeak": float(patient_df["oldpeak"].iloc[0]),
+    }
+
+    optimized_metrics = {
+        "trestbps": float(modified_df["trestbps"].iloc[0]),
+        "chol": float(modified_df["chol"].iloc[0]),
+        "thalach": float(modified_df["thalach"].iloc[0]),
+        "oldpeak": float(modified_df["oldpeak"].iloc[0]),
+    }
+
+    # Apply risk monotonicity safeguard to prevent paradoxical risk increases
+    final_risk, final_metrics = ensure_risk_monotonicity(current_risk, new_risk, current_metrics, optimized_metrics, action)
+
+    # Calculate risk reduction
+    risk_reduction = current_risk - final_risk
+
+    # Get feature importance from the current prediction
+    feature_importance = current_prediction.get("feature_importance", {})
+
+    # Generate explanation for why risk changed (or didn't)
+    explanation = generate_intervention_explanation(current_metrics, final_metrics, risk_reduction, feature_importance, action)
+
+    # Get list of modifiable features
+    modifiable_features = get_modifiable_features()
+
+    return HealthStatus(
+        current_metrics=current_metrics,
+        optimized_metrics=final_metrics,
+        current_risk=current_risk,
+        expected_risk=final_risk,
+        risk_reduction=risk_reduction,
+        explanation=explanation,
+        feature_importance=feature_importance,
+        modifiable_features=modifiable_features,
+    )
+
+
 @app.get("/", response_model=HealthCheckResponse)
 async def health_check():
     """
@@ -159,7 +297,7 @@ async def health_check():
 
 
 @app.post("/api/predict", response_model=RiskPrediction, dependencies=[Depends(verify_api_key)])
-async def predict_risk(patient: PatientInput):
+async def predict_risk(patient: PatientInput, predictor: RiskPredictor = Depends(get_risk_predictor)):
     """
     Predict cardiovascular disease risk for a patient.
 
@@ -176,15 +314,12 @@ async def predict_risk(patient: PatientInput):
     Raises:
         HTTPException: If model is not loaded or prediction fails
     """
-    if risk_predictor is None:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Risk predictor model not loaded")
-
     try:
         # Normalize patient data
         patient_normalized = patient_to_dataframe(patient)
 
         # Make prediction
-        prediction = risk_predictor.predict(patient_normalized)
+        prediction = predictor.predict(patient_normalized)
 
         logger.info("Prediction: %s (%.1f%%)", prediction["classification"], prediction["risk_score"])
 
@@ -195,8 +330,52 @@ async def predict_risk(patient: PatientInput):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Prediction failed: {str(e)}")
 
 
+@lru_cache(maxsize=SIMULATION_CACHE_SIZE)
+def recommend_cached(predictor: RiskPredictor, patient_items: tuple) -> PersonalizedRecommendation:
+    """
+    Memoised personalized recommendation backing /api/recommend.
+
+    Like simulate_cached, the result only depends on the predictor (keyed by identity)
+    and the patient's features. The cache is cleared on startup.
+
+    Args:
+        predictor: Trained risk predictor
+        patient_items: Patient features as (name, value) pairs, in PatientInput field order
+
+    Returns:
+        PersonalizedRecommendation shared by every caller with the same key; must not be mutated
+    """
+    patient_df = pd.DataFrame([dict(patient_items)])
+
+    # Get baseline risk
+    baseline_prediction = predictor.predict(patient_df)
+    baseline_risk = baseline_prediction["risk_score"]
+
+    # Calculate outcomes for all intervention options, scored in one model call
+    action_ids = [1, 2, 3, 4]
+    _, new_risks = predict_action_outcomes(predictor, patient_df, action_ids)
+
+    intervention_results = {}
+    for action_id, new_risk in zip(action_ids, new_risks.tolist()):
+        # Calculate reductions
+        risk_reduction = baseline_risk - new_risk
+        pct_reduction = (risk_reduction / baseline_risk * 100) if baseline_risk > 0 else 0
+
+        intervention_results[action_id] = {
+            "new_risk": new_risk,
+            "risk_reduction": risk_reduction,
+            "pct_reduction": pct_reduction,
+        }
+
+    # Get personalized recommendation
+    recommendation = InterventionRecommender.recommend_intervention(
+        baseline_risk=baseline_risk, intervention_results=intervention_results
+    )
+    return PersonalizedRecommendation(**recommendation)
+
+
 @app.post("/api/recommend", response_model=PersonalizedRecommendation, dependencies=[Depends(verify_api_key)])
-async def recommend_intervention(patient: PatientInput):
+async def recommend_intervention(patient: PatientInput, predictor: RiskPredictor = Depends(get_risk_predictor)):
     """
     Get personalized intervention recommendation for a patient.
 
@@ -221,58 +400,49 @@ async def recommend_intervention(patient: PatientInput):
     Raises:
         HTTPException: If model is not loaded or recommendation fails
     """
-    if risk_predictor is None:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Risk predictor model not loaded")
-
     try:
-        # Convert patient data to DataFrame
-        patient_df = patient_to_dataframe(patient)
-
-        # Get baseline risk
-        baseline_prediction = risk_predictor.predict(patient_df)
-        baseline_risk = baseline_prediction["risk_score"]
-
-        # Calculate outcomes for all intervention options
-        intervention_results = {}
-        for action_id in [1, 2, 3, 4]:
-            # Apply intervention effects
-            modified_df = apply_intervention_effects(patient_df.copy(), action_id)
-
-            # Get new risk
-            new_prediction = risk_predictor.predict(modified_df)
-            new_risk = new_prediction["risk_score"]
-
-            # Calculate reductions
-            risk_reduction = baseline_risk - new_risk
-            pct_reduction = (risk_reduction / baseline_risk * 100) if baseline_risk > 0 else 0
-
-            intervention_results[action_id] = {
-                "new_risk": new_risk,
-                "risk_reduction": risk_reduction,
-                "pct_reduction": pct_reduction,
-            }
-
-        # Get personalized recommendation
-        recommendation = InterventionRecommender.recommend_intervention(
-            baseline_risk=baseline_risk, intervention_results=intervention_results
-        )
+        # Repeated recommendations for the same patient are served from memory
+        recommendation = recommend_cached(predictor, tuple(patient.model_dump().items()))
 
         logger.info(
             "Recommendation: %s (Baseline: %.1f%%, Tier: %s)",
-            recommendation["recommendation_name"],
-            baseline_risk,
-            recommendation["risk_tier"],
+            recommendation.recommendation_name,
+            recommendation.baseline_risk,
+            recommendation.risk_tier,
         )
 
-        return PersonalizedRecommendation(**recommendation)
+        return recommendation
 
     except Exception as e:
         logger.error(f"Recommendation failed: {str(e)}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Recommendation failed: {str(e)}")
 
 
+@lru_cache(maxsize=SIMULATION_CACHE_SIZE)
+def simulate_cached(predictor: RiskPredictor, patient_items: tuple, action: int) -> HealthStatus:
+    """
+    Memoised single-intervention simulation backing /api/simulate.
+
+    Prediction and intervention effects are deterministic for a given model, so the
+    result only depends on the predictor, the patient's features and the action. The
+    predictor is part of the key (by identity), so a reloaded or overridden model
+    never serves results computed by another one. The cache is cleared on startup.
+
+    Args:
+        predictor: Trained risk predictor
+        patient_items: Patient features as (name, value) pairs, in PatientInput field order
+        action: Intervention action to simulate (0-4)
+
+    Returns:
+        HealthStatus shared by every caller with the same key; must not be mutated
+    """
+    patient_df = pd.DataFrame([dict(patient_items)])
+    current_prediction = predictor.predict(patient_df)
+    return simulate_action(predictor, patient_df, current_prediction, action)
+
+
 @app.post("/api/simulate", response_model=HealthStatus, dependencies=[Depends(verify_api_key)])
-async def simulate_intervention(request: SimulationRequest):
+async def simulate_intervention(request: SimulationRequest, predictor: RiskPredictor = Depends(get_risk_predictor)):
     """
     Simulate the effect of a specific intervention on patient metrics.
 
@@ -289,78 +459,59 @@ async def simulate_intervention(request: SimulationRequest):
     Raises:
         HTTPException: If models are not loaded or simulation fails
     """
-    if risk_predictor is None:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Models not loaded")
-
     try:
-        # Convert patient data to DataFrame (raw values - no scaling needed)
-        patient_df = patient_to_dataframe(request.patient)
+        # Repeated what-if queries for the same patient and action are served from memory
+        result = simulate_cached(predictor, tuple(request.patient.model_dump().items()), request.action)
 
-        # Get current risk
-        current_prediction = risk_predictor.predict(patient_df)
-        current_risk = current_prediction["risk_score"]
+        safe_action = str(request.action).replace("\r", "").replace("\n", "")
+        logger.info("Simulation: Action %s, Risk %.1f%% → %.1f%%", safe_action, result.current_risk, result.expected_risk)
 
-        # Apply intervention effects to raw values
-        # Using smart intervention logic with bounds checking
-        modified_df = apply_intervention_effects(patient_df.copy(), request.action)
+        return result
 
-        # Get new risk from modified data (no scaling needed)
-        new_prediction = risk_predictor.predict(modified_df)
-        new_risk = new_prediction["risk_score"]
+    except Exception as e:
+        logger.error(f"Simulation failed: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Simulation failed: {str(e)}")
 
-        # Extract key metrics for comparison (RAW VALUES)
-        current_metrics = {
-            "trestbps": float(patient_df["trestbps"].iloc[0]),
-            "chol": float(patient_df["chol"].iloc[0]),
-            "thalach": float(patient_df["thalach"].iloc[0]),
-            "oldpeak": float(patient_df["oldpeak"].iloc[0]),
-        }
 
-        optimized_metrics = {
-            "trestbps": float(modified_df["trestbps"].iloc[0]),
-            "chol": float(modified_df["chol"].iloc[0]),
-            "thalach": float(modified_df["thalach"].iloc[0]),
-            "oldpeak": float(modified_df["oldpeak"].iloc[0]),
-        }
+@app.post("/api/simulate/batch", response_model=BatchSimulationResponse, dependencies=[Depends(verify_api_key)])
+async def simulate_interventions_batch(
+    request: BatchSimulationRequest, predictor: RiskPredictor = Depends(get_risk_predictor)
+):
+    """
+    Simulate several interventions for the same patient in one request.
 
-        # Apply risk monotonicity safeguard to prevent paradoxical risk increases
-        final_risk, final_metrics = ensure_risk_monotonicity(
-            current_risk, new_risk, current_metrics, optimized_metrics, request.action
-        )
+    The patient's baseline risk is predicted once and shared by every
+    simulated action, and the post-intervention features of all actions are
+    scored in a single model call, so comparing all options costs one round trip.
+
+    Args:
+        request: BatchSimulationRequest with patient data and actions to simulate
 
-        # Calculate risk reduction
-        risk_reduction = current_risk - final_risk
+    Returns:
+        BatchSimulationResponse with one HealthStatus per action, in request order
 
-        # Get feature importance from the current prediction
-        feature_importance = current_prediction.get("feature_importance", {})
+    Raises:
+        HTTPException: If models are not loaded or simulation fails
+    """
+    try:
+        patient_df = patient_to_dataframe(request.patient)
+        current_prediction = predictor.predict(patient_df)
 
-        # Generate explanation for why risk changed (or didn't)
-        explanation = generate_intervention_explanation(
-            current_metrics, final_metrics, risk_reduction, feature_importance, request.action
-        )
+        # One row of post-intervention features per action, scored together
+        modified_df, new_risks = predict_action_outcomes(predictor, patient_df, request.actions)
 
-        # Get list of modifiable features
-        modifiable_features = get_modifiable_features()
-
-        result = HealthStatus(
-            current_metrics=current_metrics,
-            optimized_metrics=final_metrics,
-            current_risk=current_risk,
-            expected_risk=final_risk,
-            risk_reduction=risk_reduction,
-            explanation=explanation,
-            feature_importance=feature_importance,
-            modifiable_features=modifiable_features,
-        )
+        simulations = [
+            build_health_status(patient_df, modified_df.iloc[[i]], current_prediction, float(new_risk), action)
+            for i, (action, new_risk) in enumerate(zip(request.actions, new_risks))
+        ]
 
-        safe_action = str(request.action).replace("\r", "").replace("\n", "")
-        logger.info("Simulation: Action %s, Risk %.1f%% → %.1f%%", safe_action, current_risk, final_risk)
+        logger.info("Batch simulation: %d actions, baseline risk %.1f%%", len(simulations), current_prediction["risk_score"])
 
-        return result
+        return BatchSimulationResponse(simulations=simulations)
 
     except Exception as e:
-        logger.error(f"Simulation failed: {str(e)}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Simulation failed: {str(e)}")
+        logger.error(f"Batch simulation failed: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Batch simulation failed: {str(e)}")
 
 
 @app.exception_handler(Exception)
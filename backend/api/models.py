@@ -5,7 +5,7 @@ This module defines the request/response schemas for the FastAPI backend.
 All models use Pydantic for automatic validation and serialization.
 """
 
-from typing import Dict, List, Optional
+from typing import Annotated, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -168,6 +168,43 @@ class SimulationRequest(BaseModel):
     }
 
 
+class BatchSimulationRequest(BaseModel):
+    """
+    Request model for simulating several interventions on one patient.
+
+    Lets clients compare intervention options in a single round trip
+    instead of issuing one /api/simulate request per action.
+    """
+
+    patient: PatientInput = Field(..., description="Patient clinical data")
+    actions: List[Annotated[int, Field(ge=0, le=4)]] = Field(
+        ..., min_length=1, max_length=5, description="Intervention actions to simulate (0-4)"
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "patient": {
+                    "age": 63.0,
+                    "sex": 1,
+                    "cp": 3,
+                    "trestbps": 145.0,
+                    "chol": 233.0,
+                    "fbs": 1,
+                    "restecg": 0,
+                    "thalach": 150.0,
+                    "exang": 0,
+                    "oldpeak": 2.3,
+                    "slope": 2,
+                    "ca": 0,
+                    "thal": 6,
+                },
+                "actions": [0, 1, 2, 3, 4],
+            }
+        }
+    }
+
+
 class HealthStatus(BaseModel):
     """
     Response model for intervention simulation.
@@ -200,6 +237,16 @@ class HealthStatus(BaseModel):
     }
 
 
+class BatchSimulationResponse(BaseModel):
+    """
+    Response model for batch intervention simulation.
+
+    Contains one HealthStatus per requested action, in request order.
+    """
+
+    simulations: List[HealthStatus] = Field(..., description="Simulation results, one per requested action")
+
+
 class ErrorResponse(BaseModel):
     """
     Response model for error messages.
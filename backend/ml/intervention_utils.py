@@ -7,8 +7,10 @@ This module provides smart intervention logic that:
 - Prevents normalization paradoxes for healthy patients
 """
 
-from typing import Dict, List
+import random
+from typing import Dict, List, Sequence
 
+import numpy as np
 import pandas as pd
 
 # Clinical bounds for health metrics (based on medical guidelines)
@@ -19,10 +21,71 @@ METRIC_BOUNDS = {
     "oldpeak": {"min": 0.0, "max": 6.0, "optimal": 0.0, "target": 0.5},  # Lower is better (no ST depression)
 }
 
+# Base intervention effects for each action (raw data)
+# Note: exang is binary (0=no, 1=yes exercise-induced angina)
+# Interventions can reduce likelihood of exercise-induced angina
+INTERVENTION_EFFECTS = {
+    1: {  # Lifestyle Intervention
+        "trestbps": 0.95,  # 5% reduction
+        "chol": 0.90,  # 10% reduction
+        "thalach": 1.05,  # 5% increase
+        "oldpeak": 0.95,  # 5% reduction (lifestyle improves ECG)
+        "exang": 0.80,  # 20% reduction in exercise-induced angina probability
+    },
+    2: {  # Single Medication
+        "trestbps": 0.90,  # 10% reduction
+        "chol": 0.85,  # 15% reduction
+        "thalach": 1.0,  # No change
+        "oldpeak": 0.92,  # 8% reduction (meds improve cardiac function)
+        "exang": 0.70,  # 30% reduction in exercise-induced angina
+    },
+    3: {  # Combination Therapy
+        "trestbps": 0.85,  # 15% reduction
+        "chol": 0.80,  # 20% reduction
+        "thalach": 1.08,  # 8% increase
+        "oldpeak": 0.90,  # 10% reduction
+        "exang": 0.50,  # 50% reduction in exercise-induced angina
+    },
+    4: {  # Intensive Treatment
+        "trestbps": 0.80,  # 20% reduction
+        "chol": 0.75,  # 25% reduction
+        "thalach": 1.10,  # 10% increase
+        "oldpeak": 0.80,  # 20% reduction
+        "exang": 0.30,  # 70% reduction in exercise-induced angina
+    },
+}
+
+# Fixed percentage effects for normalized data (no bounds checking)
+SIMPLE_INTERVENTION_EFFECTS = {
+    1: {"trestbps": 0.95, "chol": 0.90, "thalach": 1.05},  # Lifestyle Intervention
+    2: {"trestbps": 0.90, "chol": 0.85},  # Single Medication
+    3: {"trestbps": 0.85, "chol": 0.80, "thalach": 1.08, "oldpeak": 0.90},  # Combination Therapy
+    4: {"trestbps": 0.80, "chol": 0.75, "thalach": 1.10, "oldpeak": 0.80},  # Intensive Treatment
+}
+
+# Whether exercise-induced angina resolves on normalized data, keyed by action (hash-based, per patient)
+SIMPLE_EXANG_SUCCESS = {
+    1: lambda h: h % 5 > 0,  # 80% success
+    2: lambda h: h % 10 > 2,  # 70% success
+    3: lambda h: h % 2 == 0,  # 50% success
+    4: lambda h: h % 10 > 6,  # 30% success (70% cure)
+}
+
+# Effect factors per metric as arrays indexed by action (index 0 = Monitor Only, no change),
+# so a batch looks up every row's factor in one NumPy take instead of a per-row dict lookup
+_INTERVENTION_FACTORS = {
+    metric_name: np.array([1.0] + [INTERVENTION_EFFECTS[action][metric_name] for action in range(1, 5)])
+    for metric_name in INTERVENTION_EFFECTS[1]
+}
+_SIMPLE_INTERVENTION_FACTORS = {
+    metric_name: np.array([1.0] + [SIMPLE_INTERVENTION_EFFECTS[action].get(metric_name, 1.0) for action in range(1, 5)])
+    for metric_name in ["trestbps", "chol", "thalach", "oldpeak"]
+}
 
-def calculate_adaptive_reduction(current_value: float, base_reduction: float, metric_name: str) -> float:
+
+def calculate_adaptive_reductions(current_values: np.ndarray, base_reductions: np.ndarray, metric_name: str) -> np.ndarray:
     """
-    Calculate state-dependent intervention effect.
+    Calculate state-dependent intervention effects for arrays of patients.
 
     For metrics that should be reduced (BP, cholesterol, oldpeak):
     - If already optimal or better: minimal/no reduction
@@ -35,53 +98,37 @@ def calculate_adaptive_reduction(current_value: float, base_reduction: float, me
     - If very low: apply stronger increase
 
     Args:
-        current_value: Current metric value
-        base_reduction: Base reduction factor (e.g., 0.95 for 5% reduction)
+        current_values: Current metric value for each patient
+        base_reductions: Base reduction factor for each patient
         metric_name: Name of the metric being modified
 
     Returns:
-        Adaptive reduction factor to apply
+        Array of adaptive reduction factors, one per patient
     """
     bounds = METRIC_BOUNDS.get(metric_name)
     if not bounds:
-        return base_reduction
+        return base_reductions
 
     optimal = bounds["optimal"]
     target = bounds["target"]
     max_val = bounds["max"]
 
-    # For metrics that should be reduced (BP, cholesterol, oldpeak)
     if metric_name in ["trestbps", "chol", "oldpeak"]:
-        if current_value <= optimal:
-            # Already at or below optimal - no reduction needed
-            return 1.0
-        elif current_value <= target:
-            # Between optimal and target - minimal reduction
-            reduction_strength = 0.3  # Only 30% of base reduction
-            return 1.0 - (1.0 - base_reduction) * reduction_strength
-        elif current_value <= (target + (max_val - target) * 0.5):
-            # Moderately elevated - apply base reduction
-            return base_reduction
-        else:
-            # Highly elevated - apply stronger reduction
-            reduction_strength = 1.5  # 150% of base reduction
-            stronger_reduction = 1.0 - (1.0 - base_reduction) * reduction_strength
-            return max(stronger_reduction, base_reduction * 0.8)  # Cap at 20% reduction
-
-    # For metrics that should be increased (max heart rate)
+        stronger_reductions = np.maximum(1.0 - (1.0 - base_reductions) * 1.5, base_reductions * 0.8)
+        return np.select(
+            [current_values <= optimal, current_values <= target, current_values <= (target + (max_val - target) * 0.5)],
+            [1.0, 1.0 - (1.0 - base_reductions) * 0.3, base_reductions],
+            default=stronger_reductions,
+        )
+
     elif metric_name == "thalach":
-        if current_value >= optimal:
-            # Already at or above optimal - no increase needed
-            return 1.0
-        elif current_value >= target:
-            # Between target and optimal - minimal increase
-            increase_strength = 0.3  # Only 30% of base increase
-            return 1.0 + (base_reduction - 1.0) * increase_strength
-        else:
-            # Below target - apply base increase
-            return base_reduction
+        return np.select(
+            [current_values >= optimal, current_values >= target],
+            [1.0, 1.0 + (base_reductions - 1.0) * 0.3],
+            default=base_reductions,
+        )
 
-    return base_reduction
+    return base_reductions
 
 
 def apply_simple_intervention_effects(patient_data: pd.DataFrame, action: int) -> pd.DataFrame:
@@ -100,57 +147,28 @@ def apply_simple_intervention_effects(patient_data: pd.DataFrame, action: int) -
     """
     modified_data = patient_data.copy()
 
-    if action == 0:  # Monitor Only
-        pass
-    elif action == 1:  # Lifestyle Intervention
-        modified_data["trestbps"] *= 0.95  # 5% BP reduction
-        modified_data["chol"] *= 0.90  # 10% cholesterol reduction
-        modified_data["thalach"] *= 1.05  # 5% improved max HR
-        if "exang" in modified_data.columns and modified_data["exang"].iloc[0] == 1:
-            modified_data["exang"] = 0 if hash(str(modified_data.index[0])) % 5 > 0 else 1  # 80% success
-    elif action == 2:  # Single Medication
-        modified_data["trestbps"] *= 0.90  # 10% BP reduction
-        modified_data["chol"] *= 0.85  # 15% cholesterol reduction
-        if "exang" in modified_data.columns and modified_data["exang"].iloc[0] == 1:
-            modified_data["exang"] = 0 if hash(str(modified_data.index[0])) % 10 > 2 else 1  # 70% success
-    elif action == 3:  # Combination Therapy
-        modified_data["trestbps"] *= 0.85  # 15% BP reduction
-        modified_data["chol"] *= 0.80  # 20% cholesterol reduction
-        modified_data["thalach"] *= 1.08  # 8% improved max HR
-        modified_data["oldpeak"] *= 0.90  # 10% reduced ST depression
-        if "exang" in modified_data.columns and modified_data["exang"].iloc[0] == 1:
-            modified_data["exang"] = 0 if hash(str(modified_data.index[0])) % 2 == 0 else 1  # 50% success
-    elif action == 4:  # Intensive Treatment
-        modified_data["trestbps"] *= 0.80  # 20% BP reduction
-        modified_data["chol"] *= 0.75  # 25% cholesterol reduction
-        modified_data["thalach"] *= 1.10  # 10% improved max HR
-        modified_data["oldpeak"] *= 0.80  # 20% reduced ST depression
-        if "exang" in modified_data.columns and modified_data["exang"].iloc[0] == 1:
-            modified_data["exang"] = 0 if hash(str(modified_data.index[0])) % 10 > 6 else 1  # 30% success (70% cure)
+    if action in SIMPLE_INTERVENTION_EFFECTS:
+        _apply_simple_effects(modified_data, np.full(len(modified_data), action), np.ones(len(modified_data), dtype=bool))
 
     return modified_data
 
 
-def is_normalized_data(patient_data: pd.DataFrame) -> bool:
+def normalized_rows(patient_data: pd.DataFrame) -> np.ndarray:
     """
-    Check if patient data is normalized (StandardScaler output) or raw values.
+    Flag each patient whose metrics look normalized (StandardScaler output).
 
-    Normalized data will have most values between -3 and 3 (z-scores),
-    while raw data will have physiologically meaningful ranges.
+    Normalized rows have z-score blood pressure (|trestbps| < 10), while raw
+    rows have physiologically meaningful values (typically 90-200).
 
     Args:
-        patient_data: DataFrame with patient metrics
+        patient_data: DataFrame with one patient per row
 
     Returns:
-        True if data appears to be normalized, False if raw values
+        Boolean array, True where the row appears to be normalized
     """
-    # Check blood pressure - raw values are typically 90-200
-    if "trestbps" in patient_data.columns:
-        bp_value = float(patient_data["trestbps"].iloc[0])
-        # If BP is in normalized range (typically -3 to 3), it's normalized data
-        if abs(bp_value) < 10:
-            return True
-    return False
+    if "trestbps" not in patient_data.columns:
+        return np.zeros(len(patient_data), dtype=bool)
+    return np.abs(patient_data["trestbps"].to_numpy(dtype=float)) < 10
 
 
 def apply_intervention_effects(patient_data: pd.DataFrame, action: int) -> pd.DataFrame:
@@ -170,91 +188,112 @@ def apply_intervention_effects(patient_data: pd.DataFrame, action: int) -> pd.Da
     Returns:
         Modified patient data with intervention effects applied
     """
+    return apply_intervention_effects_batch(patient_data, [action] * len(patient_data))
+
+
+def apply_intervention_effects_batch(patient_data: pd.DataFrame, actions: Sequence[int]) -> pd.DataFrame:
+    """
+    Apply a possibly different intervention to each patient row in one pass.
+
+    Row i receives actions[i]. Raw rows get the adaptive, bounds-checked effects;
+    normalized rows (as used for RL agent training) get simple percentage effects.
+    The exang outcome is seeded by each row's index label, so copies of one patient
+    should keep that patient's label to match apply_intervention_effects on it alone.
+
+    Args:
+        patient_data: DataFrame with one patient per row (raw or normalized values)
+        actions: Intervention action for each row (0=Monitor, 1=Lifestyle,
+                 2=Single Med, 3=Combo Therapy, 4=Intensive)
+
+    Returns:
+        Modified patient data with intervention effects applied
+
+    Raises:
+        ValueError: If the number of actions doesn't match the number of rows
+    """
+    actions = np.asarray(actions, dtype=int)
+    if len(actions) != len(patient_data):
+        raise ValueError(f"Expected {len(patient_data)} actions, got {len(actions)}")
+
     modified_data = patient_data.copy()
 
-    if action == 0:  # Monitor Only
+    # Monitor Only (0) and unknown actions leave the patient unchanged
+    active = np.isin(actions, list(INTERVENTION_EFFECTS))
+    if not active.any():
         return modified_data
 
-    # If data is normalized, use simple percentage reductions
-    # (for RL agent training with normalized data)
-    if is_normalized_data(patient_data):
-        return apply_simple_intervention_effects(patient_data, action)
-
-    # Define base intervention effects for each action
-    # Note: exang is binary (0=no, 1=yes exercise-induced angina)
-    # Interventions can reduce likelihood of exercise-induced angina
-    intervention_effects = {
-        1: {  # Lifestyle Intervention
-            "trestbps": 0.95,  # 5% reduction
-            "chol": 0.90,  # 10% reduction
-            "thalach": 1.05,  # 5% increase
-            "oldpeak": 0.95,  # 5% reduction (lifestyle improves ECG)
-            "exang": 0.80,  # 20% reduction in exercise-induced angina probability
-        },
-        2: {  # Single Medication
-            "trestbps": 0.90,  # 10% reduction
-            "chol": 0.85,  # 15% reduction
-            "thalach": 1.0,  # No change
-            "oldpeak": 0.92,  # 8% reduction (meds improve cardiac function)
-            "exang": 0.70,  # 30% reduction in exercise-induced angina
-        },
-        3: {  # Combination Therapy
-            "trestbps": 0.85,  # 15% reduction
-            "chol": 0.80,  # 20% reduction
-            "thalach": 1.08,  # 8% increase
-            "oldpeak": 0.90,  # 10% reduction
-            "exang": 0.50,  # 50% reduction in exercise-induced angina
-        },
-        4: {  # Intensive Treatment
-            "trestbps": 0.80,  # 20% reduction
-            "chol": 0.75,  # 25% reduction
-            "thalach": 1.10,  # 10% increase
-            "oldpeak": 0.80,  # 20% reduction
-            "exang": 0.30,  # 70% reduction in exercise-induced angina
-        },
-    }
+    normalized = normalized_rows(patient_data)
+    _apply_adaptive_effects(modified_data, actions, active & ~normalized)
+    _apply_simple_effects(modified_data, actions, active & normalized)
+
+    return modified_data
 
-    if action not in intervention_effects:
-        return modified_data
 
-    effects = intervention_effects[action]
+def _apply_adaptive_effects(modified_data: pd.DataFrame, actions: np.ndarray, rows: np.ndarray) -> None:
+    """Apply adaptive, bounds-checked effects in place to the selected raw-data rows."""
+    if not rows.any():
+        return
 
-    # Apply adaptive effects for each metric
-    for metric_name, base_factor in effects.items():
+    for metric_name in INTERVENTION_EFFECTS[1]:
         if metric_name not in modified_data.columns:
             continue
 
-        current_value = float(modified_data[metric_name].iloc[0])
+        base_factors = _INTERVENTION_FACTORS[metric_name][actions[rows]]
 
         # Special handling for binary features like exang
         if metric_name == "exang":
             # exang is binary: 1 = has exercise-induced angina, 0 = doesn't
             # If patient has angina (1), intervention can reduce it
-            if current_value == 1:
-                # Use base_factor as probability of successful treatment
-                # e.g., 0.30 means 70% chance of eliminating angina
-                import random
-
-                random.seed(int(modified_data.index[0]))  # Deterministic based on patient
-                if random.random() > base_factor:
-                    modified_data[metric_name] = 0
+            values = modified_data[metric_name].to_numpy(copy=True)
+            changed = False
+            for position, base_factor in zip(np.flatnonzero(rows), base_factors):
+                if float(values[position]) == 1:
+                    # Use base_factor as probability of successful treatment
+                    # e.g., 0.30 means 70% chance of eliminating angina
+                    random.seed(int(modified_data.index[position]))  # Deterministic based on patient
+                    if random.random() > base_factor:
+                        values[position] = 0
+                        changed = True
             # If no angina (0), keep it at 0
+            if changed:
+                modified_data[metric_name] = values
             continue
 
-        # Calculate adaptive reduction based on current state
-        adaptive_factor = calculate_adaptive_reduction(current_value, base_factor, metric_name)
+        values = modified_data[metric_name].to_numpy(dtype=float, copy=True)
+        current_values = values[rows]
 
-        # Apply the adaptive factor
-        new_value = current_value * adaptive_factor
+        # Calculate adaptive reduction based on current state, then apply it
+        new_values = current_values * calculate_adaptive_reductions(current_values, base_factors, metric_name)
 
         # Enforce clinical bounds
         bounds = METRIC_BOUNDS.get(metric_name)
         if bounds:
-            new_value = max(bounds["min"], min(bounds["max"], new_value))
+            new_values = np.clip(new_values, bounds["min"], bounds["max"])
 
-        modified_data[metric_name] = new_value
+        values[rows] = new_values
+        modified_data[metric_name] = values
 
-    return modified_data
+
+def _apply_simple_effects(modified_data: pd.DataFrame, actions: np.ndarray, rows: np.ndarray) -> None:
+    """Apply fixed percentage effects in place to the selected normalized-data rows."""
+    if not rows.any():
+        return
+
+    for metric_name, action_factors in _SIMPLE_INTERVENTION_FACTORS.items():
+        factors = action_factors[actions[rows]]
+        if (factors == 1.0).all():
+            continue
+        values = modified_data[metric_name].to_numpy(dtype=float, copy=True)
+        values[rows] *= factors
+        modified_data[metric_name] = values
+
+    if "exang" in modified_data.columns:
+        values = modified_data["exang"].to_numpy(copy=True)
+        for position in np.flatnonzero(rows):
+            if values[position] == 1:
+                resolved = SIMPLE_EXANG_SUCCESS[actions[position]](hash(str(modified_data.index[position])))
+                values[position] = 0 if resolved else 1
+        modified_data["exang"] = values
 
 
 def ensure_risk_monotonicity(
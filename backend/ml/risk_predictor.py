@@ -8,9 +8,10 @@ with comprehensive metrics and feature importance analysis.
 
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, Dict, Optional, Union
 
 import joblib
+import numpy as np
 import pandas as pd
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import (
@@ -44,17 +45,20 @@ class RiskPredictor:
         model: LogisticRegression instance
         scaler: StandardScaler for feature normalization (optional)
         random_state: Random seed for reproducibility
+        n_jobs: Number of parallel jobs used for cross-validation
         feature_names: List of feature names from training data
     """
 
-    def __init__(self, random_state: int = 42):
+    def __init__(self, random_state: int = 42, n_jobs: int = -1):
         """
         Initialize Logistic Regression classifier.
 
         Args:
             random_state: Random seed for reproducibility (default: 42)
+            n_jobs: Parallel jobs for cross-validation; -1 uses all cores (default: -1)
         """
         self.random_state = random_state
+        self.n_jobs = n_jobs
         self.model = LogisticRegression(
             random_state=random_state,
             max_iter=2000,  # Increased to ensure convergence
@@ -65,7 +69,9 @@ class RiskPredictor:
         self.feature_names: Optional[list] = None
         logger.info(f"Initialized RiskPredictor with LogisticRegression, " f"random_state={random_state}")
 
-    def train(self, X_train: pd.DataFrame, y_train: pd.Series, X_val: pd.DataFrame, y_val: pd.Series) -> Dict[str, float]:
+    def train(
+        self, X_train: pd.DataFrame, y_train: pd.Series, X_val: pd.DataFrame, y_val: pd.Series, skip_cv: bool = False
+    ) -> Dict[str, float]:
         """
         Train the Logistic Regression model with cross-validation.
 
@@ -77,6 +83,8 @@ class RiskPredictor:
             y_train: Training labels (0=no disease, 1=disease)
             X_val: Validation features (normalized)
             y_val: Validation labels
+            skip_cv: Skip the cross-validation fits when only the final model is
+                     needed (default: False)
 
         Returns:
             Dictionary containing validation metrics:
@@ -85,8 +93,8 @@ class RiskPredictor:
                 - recall: Recall score (sensitivity)
                 - f1: F1 score (harmonic mean of precision and recall)
                 - roc_auc: Area under the ROC curve
-                - cv_accuracy_mean: Mean cross-validation accuracy
-                - cv_accuracy_std: Std dev of cross-validation accuracy
+                - cv_accuracy_mean: Mean cross-validation accuracy (omitted if skip_cv)
+                - cv_accuracy_std: Std dev of cross-validation accuracy (omitted if skip_cv)
 
         Raises:
             ValueError: If input shapes are mismatched or data is invalid
@@ -104,13 +112,17 @@ class RiskPredictor:
         logger.info(f"Training on {len(self.feature_names)} features")
 
         # Perform 5-fold cross-validation on training set
-        logger.info("Performing 5-fold cross-validation...")
-        cv_scores = cross_val_score(
-            self.model, X_train, y_train, cv=5, scoring="accuracy", n_jobs=-1  # Use all available cores
-        )
-        cv_mean = cv_scores.mean()
-        cv_std = cv_scores.std()
-        logger.info(f"Cross-validation accuracy: {cv_mean:.4f} (+/- {cv_std:.4f})")
+        cv_metrics = {}
+        if not skip_cv:
+            logger.info("Performing 5-fold cross-validation...")
+            cv_scores = cross_val_score(
+                self.model, X_train, y_train, cv=5, scoring="accuracy", n_jobs=self.n_jobs  # -1 uses all available cores
+            )
+            cv_metrics = {"cv_accuracy_mean": cv_scores.mean(), "cv_accuracy_std": cv_scores.std()}
+            logger.info(
+                f"Cross-validation accuracy: {cv_metrics['cv_accuracy_mean']:.4f} "
+                f"(+/- {cv_metrics['cv_accuracy_std']:.4f})"
+            )
 
         # Train final model on full training set
         logger.info("Training final model on full training set...")
@@ -128,8 +140,7 @@ class RiskPredictor:
             "recall": recall_score(y_val, y_pred, zero_division=0),
             "f1": f1_score(y_val, y_pred, zero_division=0),
             "roc_auc": roc_auc_score(y_val, y_pred_proba),
-            "cv_accuracy_mean": cv_mean,
-            "cv_accuracy_std": cv_std,
+            **cv_metrics,
         }
 
         # Log detailed results
@@ -171,28 +182,14 @@ class RiskPredictor:
             ValueError: If model hasn't been trained or features don't match
             RuntimeError: If prediction fails
         """
-        if self.model is None or not hasattr(self.model, "classes_"):
-            raise ValueError("Model has not been trained yet. Call train() first.")
-
-        if self.feature_names is None:
-            raise ValueError("Feature names not set. Model may not be trained properly.")
-
-        # Validate feature names match
-        if list(patient_data.columns) != self.feature_names:
-            raise ValueError(f"Feature mismatch. Expected {self.feature_names}, " f"got {list(patient_data.columns)}")
+        self._validate_features(patient_data)
 
         try:
-            # Apply scaling if scaler exists
-            if self.scaler is not None:
-                patient_data_scaled = pd.DataFrame(
-                    self.scaler.transform(patient_data), columns=patient_data.columns, index=patient_data.index
-                )
-            else:
-                patient_data_scaled = patient_data
+            patient_data_scaled = self._scale(patient_data)
 
-            # Get prediction and probability
-            prediction = self.model.predict(patient_data_scaled)[0]
+            # Get probability; the predicted class is its argmax, as model.predict would return
             proba = self.model.predict_proba(patient_data_scaled)[0]
+            prediction = self.model.classes_[proba.argmax()]
             disease_proba = proba[1]  # Probability of class 1 (disease)
 
             # Convert to risk score (0-100%)
@@ -228,6 +225,50 @@ class RiskPredictor:
             logger.error(f"Prediction failed: {str(e)}")
             raise RuntimeError(f"Prediction failed: {str(e)}") from e
 
+    def predict_risk_scores(self, patient_data: pd.DataFrame) -> np.ndarray:
+        """
+        Predict risk scores for many patients in a single model call.
+
+        Equivalent to predict(row)["risk_score"] for every row, but scales and
+        scores the whole DataFrame at once, e.g. one row per simulated intervention.
+
+        Args:
+            patient_data: DataFrame with raw patient features, one row per patient
+
+        Returns:
+            Array of risk percentages (0-100%), in row order
+
+        Raises:
+            ValueError: If model hasn't been trained or features don't match
+            RuntimeError: If prediction fails
+        """
+        self._validate_features(patient_data)
+
+        try:
+            return self.model.predict_proba(self._scale(patient_data))[:, 1] * 100
+
+        except Exception as e:
+            logger.error(f"Prediction failed: {str(e)}")
+            raise RuntimeError(f"Prediction failed: {str(e)}") from e
+
+    def _validate_features(self, patient_data: pd.DataFrame) -> None:
+        """Check the model is trained and patient_data has the training features, in order"""
+        if self.model is None or not hasattr(self.model, "classes_"):
+            raise ValueError("Model has not been trained yet. Call train() first.")
+
+        if self.feature_names is None:
+            raise ValueError("Feature names not set. Model may not be trained properly.")
+
+        # Validate feature names match
+        if list(patient_data.columns) != self.feature_names:
+            raise ValueError(f"Feature mismatch. Expected {self.feature_names}, " f"got {list(patient_data.columns)}")
+
+    def _scale(self, patient_data: pd.DataFrame) -> pd.DataFrame:
+        """Apply the training scaler, if one was used"""
+        if self.scaler is None:
+            return patient_data
+        return pd.DataFrame(self.scaler.transform(patient_data), columns=patient_data.columns, index=patient_data.index)
+
     def evaluate(self, X_test: pd.DataFrame, y_test: pd.Series) -> Dict[str, float]:
         """
         Evaluate model on test set.
@@ -235,7 +276,7 @@ class RiskPredictor:
         Provides comprehensive performance metrics on held-out test data.
 
         Args:
-            X_test: Test features (normalized)
+            X_test: Test features (raw; the training scaler is applied if one was used)
             y_test: Test labels
 
         Returns:
@@ -257,6 +298,7 @@ class RiskPredictor:
 
         logger.info(f"Evaluating on test set ({len(X_test)} samples)...")
 
+        X_test = self._scale(X_test)
         y_pred = self.model.predict(X_test)
         y_pred_proba = self.model.predict_proba(X_test)[:, 1]
 
@@ -319,14 +361,14 @@ class RiskPredictor:
 
         return importance_df
 
-    def save(self, path: Path) -> None:
+    def save(self, path: Union[Path, BinaryIO]) -> None:
         """
         Save trained model to disk.
 
         Saves the Logistic Regression model, feature names, and scaler (if used).
 
         Args:
-            path: Path to save the model file (.pkl)
+            path: Path to save the model file (.pkl), or a binary file object to write it to
 
         Raises:
             ValueError: If model hasn't been trained
@@ -351,20 +393,20 @@ class RiskPredictor:
             logger.error(f"Failed to save model: {str(e)}")
             raise IOError(f"Failed to save model: {str(e)}") from e
 
-    def load(self, path: Path) -> None:
+    def load(self, path: Union[Path, BinaryIO]) -> None:
         """
         Load trained model from disk.
 
         Loads a previously saved model and restores all metadata including scaler.
 
         Args:
-            path: Path to the saved model file (.pkl)
+            path: Path to the saved model file (.pkl), or a binary file object to read it from
 
         Raises:
             FileNotFoundError: If model file doesn't exist
             IOError: If file cannot be read or is corrupted
         """
-        if not path.exists():
+        if isinstance(path, Path) and not path.exists():
             raise FileNotFoundError(f"Model file not found: {path}")
 
         try:
@@ -51,7 +51,6 @@ def main():
     scaler = StandardScaler()
     X_train_scaled = scaler.fit_transform(X_train)
     X_val_scaled = scaler.transform(X_val)
-    X_test_scaled = scaler.transform(X_test)
 
     logger.info("Feature scaling applied:")
     logger.info(f"  Scaler means: {scaler.mean_[:3]}... (showing first 3)")
@@ -62,7 +61,6 @@ def main():
 
     X_train_scaled = pd.DataFrame(X_train_scaled, columns=X_train.columns, index=X_train.index)
     X_val_scaled = pd.DataFrame(X_val_scaled, columns=X_val.columns, index=X_val.index)
-    X_test_scaled = pd.DataFrame(X_test_scaled, columns=X_test.columns, index=X_test.index)
 
     # Initialize predictor
     logger.info("\n[3/6] Initializing Logistic Regression predictor...")
@@ -76,7 +74,8 @@ def main():
 
     # Evaluate on test set
     logger.info("\n[5/6] Evaluating on test set...")
-    test_metrics = predictor.evaluate(X_test_scaled, y_test)
+    # evaluate() applies the embedded scaler itself, so it takes the raw test features
+    test_metrics = predictor.evaluate(X_test, y_test)
 
     # Display feature importance
     logger.info("\n[6/6] Feature Importance Analysis...")
@@ -120,15 +119,12 @@ def main():
     logger.info("Testing age effect with two similar patients differing only in age...")
 
     # Create two test patients
-    young_patient = X_test_scaled.iloc[[0]].copy()
+    young_patient = X_test.iloc[[0]].copy()
     old_patient = young_patient.copy()
 
-    # Only change age (using scaled values)
-    young_age_scaled = (35 - scaler.mean_[0]) / scaler.scale_[0]
-    old_age_scaled = (70 - scaler.mean_[0]) / scaler.scale_[0]
-
-    young_patient.iloc[0, 0] = young_age_scaled  # age column
-    old_patient.iloc[0, 0] = old_age_scaled  # age column
+    # Only change age (raw values; predict() applies the embedded scaler)
+    young_patient.iloc[0, 0] = 35  # age column
+    old_patient.iloc[0, 0] = 70  # age column
 
     young_pred = predictor.predict(young_patient)
     old_pred = predictor.predict(old_patient)
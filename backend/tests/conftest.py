@@ -4,16 +4,20 @@ Shared test fixtures and configuration for pytest.
 This module provides common fixtures used across all test modules.
 """
 
+import hashlib
 import os
-import sys
 from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Mapping
 
-import pytest
-from fastapi.testclient import TestClient
+# Keep native thread pools single-threaded so pytest-xdist workers don't oversubscribe
+# the CPU; must be set before numpy/scikit-learn are first imported
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
 
-# Add backend directory to Python path
-backend_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_dir))
+import pandas as pd
+import pytest
 
 # Configure test environment variables before importing app
 os.environ["API_KEY_ENABLED"] = "false"
@@ -21,29 +25,85 @@ os.environ["RATE_LIMIT_ENABLED"] = "false"
 os.environ["ENVIRONMENT"] = "development"
 os.environ["CORS_ORIGINS"] = "http://localhost:3000,http://testserver"
 
-from api.main import app
+from api.config import get_settings
+from data.load import TEST_DATA_PATH, TRAIN_DATA_PATH, VAL_DATA_PATH, load_processed_data
+from ml.risk_predictor import RiskPredictor
 
+# Seed used for every model trained inside the test suite
+TEST_RANDOM_STATE = 42
 
-@pytest.fixture
-def client():
+# xdist already runs one worker per core, so models train single-process
+TEST_N_JOBS = 1
+
+
+@pytest.fixture(scope="session")
+def app():
+    """
+    The FastAPI application, imported on first use.
+
+    Importing api.main pulls in FastAPI, Starlette and every route module, so it is
+    deferred until an API test needs it; runs selecting only ML or data tests skip it.
+    """
+    from api.main import app
+
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(app):
     """
     Create a test client for the FastAPI app.
 
     This fixture provides a TestClient instance that can be used
-    to make requests to the API endpoints in tests.
+    to make requests to the API endpoints in tests. It is shared by the
+    whole session and used as a context manager, so the app lifespan
+    (model loading) runs once rather than once per test, and every request
+    is served by the same event loop thread instead of starting a new one per call.
     """
+    from fastapi.testclient import TestClient
+
     with TestClient(app) as test_client:
         yield test_client
 
 
+@pytest.fixture(scope="module")
+def risk_predictor_override(app, trained_risk_predictor):
+    """
+    Serve the session's trained_risk_predictor from the API's get_risk_predictor dependency.
+
+    API integration tests then exercise the same model instance as the ML tests,
+    and never see a 503 from a missing model. Module-scoped, so the override is
+    removed when the requesting module finishes and later tests on the same
+    worker get the model loaded by the app lifespan.
+    """
+    from api.main import get_risk_predictor
+
+    app.dependency_overrides[get_risk_predictor] = lambda: trained_risk_predictor
+    yield trained_risk_predictor
+    app.dependency_overrides.pop(get_risk_predictor, None)
+
+
+@pytest.fixture(scope="module")
+def api_client(client, risk_predictor_override):
+    """
+    The session test client, for API integration tests served by trained_risk_predictor.
+
+    This is the same TestClient as ``client``, so the app lifespan (model loading)
+    still runs only once per session; only the risk predictor dependency differs.
+    """
+    return client
+
+
 @pytest.fixture
-def authenticated_client():
+def authenticated_client(app):
     """
     Create an authenticated test client for testing API key auth.
 
     Sets up environment with API key authentication enabled and
     provides the valid API key in request headers.
     """
+    from fastapi.testclient import TestClient
+
     # Enable API key auth for this test
     os.environ["API_KEY_ENABLED"] = "true"
     os.environ["API_KEYS"] = "test_key_123,test_key_456"
@@ -60,3 +120,285 @@ def authenticated_client():
 
     # Reset to disabled after test
     os.environ["API_KEY_ENABLED"] = "false"
+
+
+@pytest.fixture(scope="session")
+def tmp_model_dir(tmp_path_factory):
+    """
+    Provide one temporary directory for model persistence tests.
+
+    Shared by the whole session; tests should write uniquely named files into it.
+    pytest prunes old tmp_path_factory roots itself.
+    """
+    return tmp_path_factory.mktemp("models")
+
+
+DATA_SPLITS = {"train": TRAIN_DATA_PATH, "val": VAL_DATA_PATH, "test": TEST_DATA_PATH}
+
+
+@pytest.fixture(scope="session")
+def processed_data(request):
+    """
+    Load the processed train/val/test splits once per test session.
+
+    The parsed splits are pickled into pytest's cache directory keyed by the
+    source CSVs' modification times, so later sessions skip CSV parsing.
+
+    Skips dependent tests if the data cannot be loaded (e.g. offline with no
+    processed CSVs on disk).
+    """
+    cache = getattr(request.config, "cache", None)
+    cache_paths = None
+    if cache is not None and all(path.exists() for path in DATA_SPLITS.values()):
+        cache_dir = cache.mkdir("processed_data")
+        cache_paths = {split: cache_dir / f"{split}_{path.stat().st_mtime_ns}.pkl" for split, path in DATA_SPLITS.items()}
+        if all(path.exists() for path in cache_paths.values()):
+            return _with_feature_splits({split: pd.read_pickle(path) for split, path in cache_paths.items()})
+
+    try:
+        train_df, val_df, test_df = load_processed_data()
+    except Exception as e:
+        pytest.skip(f"Could not load processed data: {str(e)}")
+
+    data = {"train": train_df, "val": val_df, "test": test_df}
+
+    if cache_paths is not None:
+        for split, df in data.items():
+            _write_cache_atomically(cache_paths[split], df.to_pickle)
+
+    return _with_feature_splits(data)
+
+
+def _write_cache_atomically(path: Path, write: Callable[[Path], None]) -> None:
+    """
+    Write a cache file via a per-process temporary file and an atomic rename.
+
+    pytest-xdist workers share the cache directory and may populate the same
+    entry concurrently; the rename means readers only ever see complete files.
+    """
+    tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp")
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _with_feature_splits(data: dict) -> dict:
+    """
+    Add precomputed feature/label views for each split.
+
+    Adds X_<split>/y_<split> for train, val and test, plus ``patient``: the
+    first test row as a one-row DataFrame, as used by single-patient tests.
+    """
+    for split in DATA_SPLITS:
+        df = data[split]
+        data[f"X_{split}"] = df.drop(columns=["target"])
+        data[f"y_{split}"] = df["target"]
+    data["patient"] = data["X_test"].iloc[[0]]
+    return data
+
+
+def _training_cache_key(predictor: RiskPredictor) -> str:
+    """Hash the training CSVs and the model's hyperparameters, for cache invalidation."""
+    digest = hashlib.sha256()
+    for path in (TRAIN_DATA_PATH, VAL_DATA_PATH):
+        digest.update(path.read_bytes())
+    digest.update(repr(sorted(predictor.model.get_params().items())).encode())
+    return digest.hexdigest()[:16]
+
+
+@pytest.fixture(scope="session")
+def trained_risk_predictor(request):
+    """
+    Provide a trained risk predictor once per session for integration testing.
+
+    Loads the committed model artifact the API serves when it exists. Otherwise a
+    model is trained and stored in pytest's cache directory keyed by a hash of the
+    training data and the model hyperparameters (including the random seed), so later
+    sessions load it instead of retraining.
+    """
+    predictor = RiskPredictor(random_state=TEST_RANDOM_STATE, n_jobs=TEST_N_JOBS)
+
+    artifact_path = get_settings().risk_predictor_path
+    if artifact_path.exists():
+        predictor.load(artifact_path)
+        return predictor
+
+    processed_data = request.getfixturevalue("processed_data")
+
+    cache = getattr(request.config, "cache", None)
+    model_path = None
+    if cache is not None:
+        cache_dir = cache.mkdir("risk_predictor")
+        model_path = cache_dir / f"{_training_cache_key(predictor)}.pkl"
+        if model_path.exists():
+            predictor.load(model_path)
+            return predictor
+
+    predictor.train(processed_data["X_train"], processed_data["y_train"], processed_data["X_val"], processed_data["y_val"])
+
+    if model_path is not None:
+        _write_cache_atomically(model_path, predictor.save)
+
+    return predictor
+
+
+# Patient profiles shared across test modules. Session-scoped and read-only, so every
+# test sees the same object; tests that need to vary a field work on a dict() copy.
+
+
+@pytest.fixture(scope="session")
+def healthy_patient():
+    """
+    Healthy patient with optimal metrics who should NOT receive aggressive treatment.
+
+    Clinical Profile:
+    - Young age (45)
+    - Optimal BP (110 mmHg)
+    - Optimal cholesterol (180 mg/dL)
+    - Good exercise capacity (thalach=160, exang=0, oldpeak=0)
+    - No cardiac abnormalities
+
+    Expected Recommendations:
+    - Monitor Only (action 0) or Lifestyle (action 1) for primary prevention
+    - Should NOT receive medications due to low risk
+    """
+    return MappingProxyType(
+        {
+            "age": 45,
+            "sex": 1,
+            "cp": 1,  # Typical angina (cp must be 1-4)
+            "trestbps": 110,  # Optimal BP
+            "chol": 180,  # Optimal cholesterol
+            "fbs": 0,
+            "restecg": 0,
+            "thalach": 160,  # Good max heart rate
+            "exang": 0,  # No exercise-induced angina
+            "oldpeak": 0.0,  # No ST depression
+            "slope": 1,
+            "ca": 0,
+            "thal": 3,  # Normal (thal must be 3, 6, or 7)
+        }
+    )
+
+
+@pytest.fixture(scope="session")
+def unhealthy_patient():
+    """Unhealthy patient with elevated risk factors"""
+    return MappingProxyType(
+        {
+            "age": 60,
+            "sex": 1,
+            "cp": 3,
+            "trestbps": 160,
+            "chol": 280,
+            "fbs": 1,
+            "restecg": 1,
+            "thalach": 120,
+            "exang": 1,
+            "oldpeak": 2.5,
+            "slope": 2,
+            "ca": 2,
+            "thal": 3,
+        }
+    )
+
+
+@pytest.fixture(scope="session")
+def moderate_risk_patient():
+    """
+    Moderate-risk patient with some elevated risk factors.
+
+    Clinical Profile:
+    - Middle age (55)
+    - Stage 1 hypertension (150 mmHg)
+    - Borderline high cholesterol (250 mg/dL)
+    - Moderate exercise capacity (thalach=135, exang=0, oldpeak=1.5)
+    - Some cardiac abnormalities (ca=1)
+
+    Expected Recommendations:
+    - Lifestyle Intervention (action 1) or Single Medication (action 2)
+    - Initial lifestyle modification, medication if no improvement
+    - Should see moderate improvements in BP and cholesterol
+    """
+    return MappingProxyType(
+        {
+            "age": 55,
+            "sex": 1,
+            "cp": 3,
+            "trestbps": 150,  # Moderately high BP
+            "chol": 250,  # Moderately high cholesterol
+            "fbs": 0,
+            "restecg": 0,
+            "thalach": 135,  # Moderate max heart rate
+            "exang": 0,
+            "oldpeak": 1.5,
+            "slope": 2,
+            "ca": 1,
+            "thal": 3,
+        }
+    )
+
+
+@pytest.fixture(scope="session")
+def high_risk_patient():
+    """
+    High-risk patient who should benefit significantly from intensive interventions.
+
+    Clinical Profile:
+    - Older age (65)
+    - Severe hypertension (170 mmHg)
+    - Severe hyperlipidemia (300 mg/dL)
+    - Poor exercise capacity (thalach=110, exang=1, oldpeak=3.0)
+    - Multiple cardiac abnormalities (ca=2, thal=7)
+
+    Expected Recommendations:
+    - Combination Therapy (action 3) or Intensive Treatment (action 4)
+    - Medications are clinically indicated due to high risk
+    - Should see significant improvements in BP, cholesterol, and cardiac metrics
+    """
+    return MappingProxyType(
+        {
+            "age": 65,
+            "sex": 1,
+            "cp": 4,  # Asymptomatic
+            "trestbps": 170,  # High BP
+            "chol": 300,  # High cholesterol
+            "fbs": 1,
+            "restecg": 1,
+            "thalach": 110,  # Low max heart rate
+            "exang": 1,  # Exercise-induced angina
+            "oldpeak": 3.0,  # Significant ST depression
+            "slope": 2,
+            "ca": 2,
+            "thal": 7,  # Reversible defect
+        }
+    )
+
+
+def _memo_key(value):
+    """Make a call argument hashable: mappings (patient profiles) are keyed by their items."""
+    return tuple(value.items()) if isinstance(value, Mapping) else value
+
+
+@pytest.fixture(scope="session")
+def memoize():
+    """
+    Wrap a pure function so repeated calls with equal arguments share one result.
+
+    Module-scoped fixtures use it to memoise API responses and model analyses that
+    many tests assert different invariants on, so each unique call runs only once.
+    Mapping arguments are keyed by their items, so equal profiles from different
+    fixtures share a cache entry.
+    """
+
+    def wrap(compute: Callable) -> Callable:
+        cache = {}
+
+        def memoized(*args):
+            key = tuple(_memo_key(arg) for arg in args)
+            if key not in cache:
+                cache[key] = compute(*args)
+            return cache[key]
+
+        return memoized
+
+    return wrap
@@ -11,6 +11,7 @@ Tests cover:
 - Response schema validation
 """
 
+import pandas as pd
 import pytest
 
 
@@ -211,7 +212,11 @@ class TestRecommendEndpoint:
 
     def test_recommend_consistency(self, client, valid_patient_data):
         """Test that recommendations are consistent for same input"""
+        from api.main import recommend_cached
+
         response1 = client.post("/api/recommend", json=valid_patient_data)
+        # Recompute rather than serve the memoised response, so determinism is actually checked
+        recommend_cached.cache_clear()
         response2 = client.post("/api/recommend", json=valid_patient_data)
 
         data1 = response1.json()
@@ -222,6 +227,18 @@ class TestRecommendEndpoint:
         assert data1["recommendation_name"] == data2["recommendation_name"]
         assert abs(data1["baseline_risk"] - data2["baseline_risk"]) < 0.1
 
+    def test_recommend_repeated_request_is_memoised(self, client, valid_patient_data):
+        """Test that repeating a recommendation is served from the in-memory cache"""
+        from api.main import recommend_cached
+
+        first = client.post("/api/recommend", json=valid_patient_data)
+        hits = recommend_cached.cache_info().hits
+
+        second = client.post("/api/recommend", json=valid_patient_data)
+
+        assert recommend_cached.cache_info().hits == hits + 1
+        assert second.json() == first.json()
+
 
 class TestSimulateEndpoint:
     """Test intervention simulation endpoint"""
@@ -284,6 +301,19 @@ class TestSimulateEndpoint:
         assert data["current_risk"] >= 0
         assert data["expected_risk"] >= 0
 
+    def test_simulate_monitor_only_skips_model(self, valid_patient_data):
+        """Test that Monitor Only reuses the baseline prediction instead of calling the model"""
+        from api.main import simulate_action
+
+        current_prediction = {"risk_score": 42.0, "feature_importance": {}}
+
+        # No predictor: any model call would fail
+        result = simulate_action(None, pd.DataFrame([valid_patient_data]), current_prediction, 0)
+
+        assert result.expected_risk == result.current_risk == 42.0
+        assert result.risk_reduction == 0.0
+        assert result.optimized_metrics == result.current_metrics
+
     def test_simulate_invalid_action(self, client, valid_patient_data):
         """Test simulation with invalid action"""
         simulation_request = {"patient": valid_patient_data, "action": 10}  # Invalid action
@@ -305,6 +335,43 @@ class TestSimulateEndpoint:
         # Should return validation error
         assert response.status_code == 422
 
+    @pytest.mark.parametrize("exang", [0, 1])
+    def test_simulate_batch_matches_single(self, client, valid_patient_data, exang):
+        """Test batch simulation returns one result per action matching /api/simulate"""
+        # exang=1 exercises the per-patient deterministic angina outcome
+        patient = {**valid_patient_data, "exang": exang}
+        batch_request = {"patient": patient, "actions": [0, 2, 4]}
+
+        response = client.post("/api/simulate/batch", json=batch_request)
+
+        assert response.status_code == 200
+        simulations = response.json()["simulations"]
+        assert len(simulations) == 3
+
+        for action, simulation in zip(batch_request["actions"], simulations):
+            single = client.post("/api/simulate", json={"patient": patient, "action": action}).json()
+            assert simulation["expected_risk"] == pytest.approx(single["expected_risk"])
+            assert simulation["optimized_metrics"] == single["optimized_metrics"]
+
+    def test_simulate_repeated_request_is_memoised(self, client, valid_patient_data):
+        """Test that repeating a simulation is served from the in-memory cache"""
+        from api.main import simulate_cached
+
+        simulation_request = {"patient": valid_patient_data, "action": 3}
+        first = client.post("/api/simulate", json=simulation_request)
+        hits = simulate_cached.cache_info().hits
+
+        second = client.post("/api/simulate", json=simulation_request)
+
+        assert simulate_cached.cache_info().hits == hits + 1
+        assert second.json() == first.json()
+
+    def test_simulate_batch_invalid_action(self, client, valid_patient_data):
+        """Test batch simulation rejects out-of-range actions"""
+        response = client.post("/api/simulate/batch", json={"patient": valid_patient_data, "actions": [1, 10]})
+
+        assert response.status_code == 422
+
 
 class TestErrorHandling:
     """Test error handling across endpoints"""
@@ -334,6 +401,19 @@ class TestErrorHandling:
 
         assert response.status_code == 422
 
+    def test_model_not_loaded(self, monkeypatch):
+        """Test that the risk predictor dependency reports 503 when no model is loaded"""
+        from fastapi import HTTPException
+
+        import api.main
+
+        monkeypatch.setattr(api.main, "risk_predictor", None)
+
+        with pytest.raises(HTTPException) as exc_info:
+            api.main.get_risk_predictor()
+
+        assert exc_info.value.status_code == 503
+
 
 class TestCORS:
     """Test CORS configuration"""
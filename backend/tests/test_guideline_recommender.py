@@ -9,11 +9,146 @@ This test suite validates that the guideline-based recommender:
 5. Maintains API compatibility with the RL agent
 """
 
+import re
+from types import MappingProxyType
+
 import pandas as pd
 import pytest
 
 from ml.guideline_recommender import GuidelineRecommender
 
+# Keyword patterns scanned once over the rationale text
+_LEVEL_RE = re.compile(r"risk|medium|low|high|very", re.I)
+_INTERVENTION_RE = re.compile(r"monitor|lifestyle|medication|combination|intensive", re.I)
+
+# Shared patient profiles (read-only so tests cannot mutate shared state)
+BASE_PATIENT = MappingProxyType(
+    {
+        "age": 50,
+        "sex": 1,
+        "cp": 0,
+        "trestbps": 120,  # Normal BP
+        "chol": 200,  # Normal cholesterol
+        "fbs": 0,
+        "restecg": 0,
+        "thalach": 150,
+        "exang": 0,
+        "oldpeak": 0.5,  # Minimal ST depression
+        "slope": 1,
+        "ca": 0,
+        "thal": 2,
+    }
+)
+
+SEVERE_MULTI_PATIENT = MappingProxyType(
+    {
+        **BASE_PATIENT,
+        "cp": 3,
+        "trestbps": 170,  # Severe hypertension
+        "chol": 290,  # Very high cholesterol
+        "oldpeak": 2.5,  # Severe ST depression
+        "slope": 2,
+    }
+)
+
+BORDERLINE_PATIENT = MappingProxyType(
+    {
+        "age": 55,
+        "sex": 1,
+        "cp": 2,
+        "trestbps": 165,  # Severe hypertension
+        "chol": 245,  # Moderate cholesterol
+        "fbs": 0,
+        "restecg": 0,
+        "thalach": 140,
+        "exang": 1,  # Moderate factor
+        "oldpeak": 1.2,  # Moderate ST depression
+        "slope": 2,
+        "ca": 1,  # Moderate factor
+        "thal": 3,
+    }
+)
+
+HIGH_RISK_PATIENT = MappingProxyType(
+    {
+        "age": 65,
+        "sex": 1,
+        "cp": 3,
+        "trestbps": 150,
+        "chol": 260,
+        "fbs": 1,
+        "restecg": 1,
+        "thalach": 110,
+        "exang": 1,
+        "oldpeak": 3.0,
+        "slope": 2,
+        "ca": 2,
+        "thal": 3,
+    }
+)
+
+VERY_HIGH_RISK_PATIENT = MappingProxyType(
+    {
+        "age": 70,
+        "sex": 1,
+        "cp": 4,
+        "trestbps": 180,
+        "chol": 300,
+        "fbs": 1,
+        "restecg": 2,
+        "thalach": 100,
+        "exang": 1,
+        "oldpeak": 4.0,
+        "slope": 3,
+        "ca": 3,
+        "thal": 7,
+    }
+)
+
+RATIONALE_FACTORS_PATIENT = MappingProxyType(
+    {
+        "age": 60,
+        "sex": 1,
+        "cp": 3,
+        "trestbps": 165,  # Severe
+        "chol": 250,  # Moderate
+        "fbs": 0,
+        "restecg": 0,
+        "thalach": 140,
+        "exang": 1,  # Moderate
+        "oldpeak": 1.5,
+        "slope": 2,
+        "ca": 0,
+        "thal": 3,
+    }
+)
+
+SAMPLE_PATIENT = MappingProxyType(
+    {
+        "age": 55,
+        "sex": 1,
+        "cp": 2,
+        "trestbps": 145,
+        "chol": 233,
+        "fbs": 1,
+        "restecg": 0,
+        "thalach": 150,
+        "exang": 0,
+        "oldpeak": 2.3,
+        "slope": 2,
+        "ca": 0,
+        "thal": 6,
+    }
+)
+
+# Minimal patient with every checked metric below its risk threshold
+NEUTRAL_PATIENT = MappingProxyType({"trestbps": 120, "chol": 200, "thalach": 150, "oldpeak": 0.5, "exang": 0, "ca": 0})
+
+
+def make_patient(profile) -> pd.DataFrame:
+    """Build a one-row patient DataFrame from a shared profile."""
+    return pd.DataFrame([dict(profile)])
+
 
 class MockRiskPredictor:
     """Mock risk predictor for testing."""
@@ -37,70 +172,47 @@ class TestBasicRecommendations:
     def recommender(self):
         return GuidelineRecommender()
 
-    @pytest.fixture
-    def base_patient(self):
-        """Create a baseline patient with no severe risk factors."""
-        return pd.DataFrame(
-            [
-                {
-                    "age": 50,
-                    "sex": 1,
-                    "cp": 0,
-                    "trestbps": 120,  # Normal BP
-                    "chol": 200,  # Normal cholesterol
-                    "fbs": 0,
-                    "restecg": 0,
-                    "thalach": 150,
-                    "exang": 0,
-                    "oldpeak": 0.5,  # Minimal ST depression
-                    "slope": 1,
-                    "ca": 0,
-                    "thal": 2,
-                }
-            ]
-        )
-
-    def test_very_low_risk_monitor_only(self, recommender, base_patient):
+    def test_very_low_risk_monitor_only(self, recommender):
         """Test that very low risk (<15%) recommends monitoring only."""
         predictor = MockRiskPredictor(risk_score=10.0)
-        recommendation = recommender.recommend(base_patient, predictor)
+        recommendation = recommender.recommend(make_patient(BASE_PATIENT), predictor)
 
         assert recommendation["action"] == 0
         assert recommendation["action_name"] == "Monitor Only"
         assert "rationale" in recommendation
         assert "very low" in recommendation["rationale"].lower()
 
-    def test_low_risk_lifestyle(self, recommender, base_patient):
+    def test_low_risk_lifestyle(self, recommender):
         """Test that low risk (15-30%) recommends lifestyle intervention."""
         predictor = MockRiskPredictor(risk_score=20.0)
-        recommendation = recommender.recommend(base_patient, predictor)
+        recommendation = recommender.recommend(make_patient(BASE_PATIENT), predictor)
 
         assert recommendation["action"] == 1
         assert recommendation["action_name"] == "Lifestyle Intervention"
         assert "rationale" in recommendation
 
-    def test_medium_risk_single_medication(self, recommender, base_patient):
+    def test_medium_risk_single_medication(self, recommender):
         """Test that medium risk (30-50%) recommends single medication."""
         predictor = MockRiskPredictor(risk_score=40.0)
-        recommendation = recommender.recommend(base_patient, predictor)
+        recommendation = recommender.recommend(make_patient(BASE_PATIENT), predictor)
 
         assert recommendation["action"] == 2
         assert recommendation["action_name"] == "Single Medication"
         assert "rationale" in recommendation
 
-    def test_high_risk_combination_therapy(self, recommender, base_patient):
+    def test_high_risk_combination_therapy(self, recommender):
         """Test that high risk (50-70%) recommends combination therapy."""
         predictor = MockRiskPredictor(risk_score=60.0)
-        recommendation = recommender.recommend(base_patient, predictor)
+        recommendation = recommender.recommend(make_patient(BASE_PATIENT), predictor)
 
         assert recommendation["action"] == 3
         assert recommendation["action_name"] == "Combination Therapy"
         assert "rationale" in recommendation
 
-    def test_very_high_risk_intensive(self, recommender, base_patient):
+    def test_very_high_risk_intensive(self, recommender):
         """Test that very high risk (≥70%) recommends intensive treatment."""
         predictor = MockRiskPredictor(risk_score=80.0)
-        recommendation = recommender.recommend(base_patient, predictor)
+        recommendation = recommender.recommend(make_patient(BASE_PATIENT), predictor)
 
         assert recommendation["action"] == 4
         assert recommendation["action_name"] == "Intensive Treatment"
@@ -117,25 +229,7 @@ class TestRiskFactorEscalation:
     def test_multiple_severe_factors_escalates(self, recommender):
         """Test that multiple severe risk factors escalate treatment."""
         # Patient with low base risk (25%) but multiple severe factors
-        patient = pd.DataFrame(
-            [
-                {
-                    "age": 50,
-                    "sex": 1,
-                    "cp": 3,
-                    "trestbps": 170,  # Severe hypertension
-                    "chol": 290,  # Very high cholesterol
-                    "fbs": 0,
-                    "restecg": 0,
-                    "thalach": 150,
-                    "exang": 0,
-                    "oldpeak": 2.5,  # Severe ST depression
-                    "slope": 2,
-                    "ca": 0,
-                    "thal": 2,
-                }
-            ]
-        )
+        patient = make_patient(SEVERE_MULTI_PATIENT)
 
         predictor = MockRiskPredictor(risk_score=25.0)
         recommendation = recommender.recommend(patient, predictor, denormalized_data=patient)
@@ -147,25 +241,7 @@ class TestRiskFactorEscalation:
 
     def test_single_severe_factor_borderline_risk(self, recommender):
         """Test that single severe factor at borderline risk may escalate."""
-        patient = pd.DataFrame(
-            [
-                {
-                    "age": 55,
-                    "sex": 1,
-                    "cp": 2,
-                    "trestbps": 165,  # Severe hypertension
-                    "chol": 245,  # Moderate cholesterol
-                    "fbs": 0,
-                    "restecg": 0,
-                    "thalach": 140,
-                    "exang": 1,  # Moderate factor
-                    "oldpeak": 1.2,  # Moderate ST depression
-                    "slope": 2,
-                    "ca": 1,  # Moderate factor
-                    "thal": 3,
-                }
-            ]
-        )
+        patient = make_patient(BORDERLINE_PATIENT)
 
         predictor = MockRiskPredictor(risk_score=28.0)  # Borderline low/medium
         recommendation = recommender.recommend(patient, predictor, denormalized_data=patient)
@@ -178,25 +254,7 @@ class TestRiskFactorEscalation:
 
     def test_high_risk_never_monitor_only(self, recommender):
         """Test that high risk (≥50%) never recommends monitoring only."""
-        patient = pd.DataFrame(
-            [
-                {
-                    "age": 65,
-                    "sex": 1,
-                    "cp": 3,
-                    "trestbps": 150,
-                    "chol": 260,
-                    "fbs": 1,
-                    "restecg": 1,
-                    "thalach": 110,
-                    "exang": 1,
-                    "oldpeak": 3.0,
-                    "slope": 2,
-                    "ca": 2,
-                    "thal": 3,
-                }
-            ]
-        )
+        patient = make_patient(HIGH_RISK_PATIENT)
 
         predictor = MockRiskPredictor(risk_score=65.0)
         recommendation = recommender.recommend(patient, predictor, denormalized_data=patient)
@@ -207,25 +265,7 @@ class TestRiskFactorEscalation:
 
     def test_very_high_risk_intensive_or_combination(self, recommender):
         """Test that very high risk (≥70%) gets intensive treatment."""
-        patient = pd.DataFrame(
-            [
-                {
-                    "age": 70,
-                    "sex": 1,
-                    "cp": 4,
-                    "trestbps": 180,
-                    "chol": 300,
-                    "fbs": 1,
-                    "restecg": 2,
-                    "thalach": 100,
-                    "exang": 1,
-                    "oldpeak": 4.0,
-                    "slope": 3,
-                    "ca": 3,
-                    "thal": 7,
-                }
-            ]
-        )
+        patient = make_patient(VERY_HIGH_RISK_PATIENT)
 
         predictor = MockRiskPredictor(risk_score=85.0)
         recommendation = recommender.recommend(patient, predictor, denormalized_data=patient)
@@ -242,55 +282,26 @@ class TestRiskFactorIdentification:
     def recommender(self):
         return GuidelineRecommender()
 
-    def test_identifies_severe_hypertension(self, recommender):
-        """Test that severe hypertension is identified."""
-        patient = pd.DataFrame([{"trestbps": 170, "chol": 200, "thalach": 150, "oldpeak": 0.5, "exang": 0, "ca": 0}])
-
-        predictor = MockRiskPredictor(risk_score=40.0)
-        recommendation = recommender.recommend(patient, predictor, denormalized_data=patient)
-
-        assert recommendation["risk_factors"]["severe_count"] >= 1
-        assert any("hypertension" in detail.lower() for detail in recommendation["risk_factors"]["details"])
-
-    def test_identifies_very_high_cholesterol(self, recommender):
-        """Test that very high cholesterol is identified."""
-        patient = pd.DataFrame([{"trestbps": 120, "chol": 290, "thalach": 150, "oldpeak": 0.5, "exang": 0, "ca": 0}])
-
-        predictor = MockRiskPredictor(risk_score=40.0)
-        recommendation = recommender.recommend(patient, predictor, denormalized_data=patient)
-
-        assert recommendation["risk_factors"]["severe_count"] >= 1
-        assert any("cholesterol" in detail.lower() for detail in recommendation["risk_factors"]["details"])
-
-    def test_identifies_significant_st_depression(self, recommender):
-        """Test that significant ST depression is identified."""
-        patient = pd.DataFrame([{"trestbps": 120, "chol": 200, "thalach": 150, "oldpeak": 2.5, "exang": 0, "ca": 0}])
-
-        predictor = MockRiskPredictor(risk_score=40.0)
-        recommendation = recommender.recommend(patient, predictor, denormalized_data=patient)
-
-        assert recommendation["risk_factors"]["severe_count"] >= 1
-        assert any("st depression" in detail.lower() for detail in recommendation["risk_factors"]["details"])
-
-    def test_identifies_exercise_induced_angina(self, recommender):
-        """Test that exercise-induced angina is identified as moderate factor."""
-        patient = pd.DataFrame([{"trestbps": 120, "chol": 200, "thalach": 150, "oldpeak": 0.5, "exang": 1, "ca": 0}])
-
-        predictor = MockRiskPredictor(risk_score=40.0)
-        recommendation = recommender.recommend(patient, predictor, denormalized_data=patient)
-
-        assert recommendation["risk_factors"]["moderate_count"] >= 1
-        assert any("angina" in detail.lower() for detail in recommendation["risk_factors"]["details"])
-
-    def test_identifies_vessel_disease(self, recommender):
-        """Test that vessel disease is identified."""
-        patient = pd.DataFrame([{"trestbps": 120, "chol": 200, "thalach": 150, "oldpeak": 0.5, "exang": 0, "ca": 2}])
+    @pytest.mark.parametrize(
+        "overrides,bucket,keyword",
+        [
+            ({"trestbps": 170}, "severe_count", "hypertension"),
+            ({"chol": 290}, "severe_count", "cholesterol"),
+            ({"oldpeak": 2.5}, "severe_count", "st depression"),
+            ({"exang": 1}, "moderate_count", "angina"),
+            ({"ca": 2}, "moderate_count", "vessel"),
+        ],
+        ids=["severe_hypertension", "very_high_cholesterol", "significant_st_depression", "exercise_angina", "vessel_disease"],
+    )
+    def test_identifies_factor(self, recommender, overrides, bucket, keyword):
+        """Test that each individual risk factor is counted and described."""
+        patient = make_patient({**NEUTRAL_PATIENT, **overrides})
 
         predictor = MockRiskPredictor(risk_score=40.0)
         recommendation = recommender.recommend(patient, predictor, denormalized_data=patient)
 
-        assert recommendation["risk_factors"]["moderate_count"] >= 1
-        assert any("vessel" in detail.lower() for detail in recommendation["risk_factors"]["details"])
+        assert recommendation["risk_factors"][bucket] >= 1
+        assert any(keyword in detail.lower() for detail in recommendation["risk_factors"]["details"])
 
 
 class TestClinicalRationale:
@@ -302,54 +313,18 @@ class TestClinicalRationale:
 
     def test_rationale_includes_risk_level(self, recommender):
         """Test that rationale includes risk classification."""
-        patient = pd.DataFrame(
-            [
-                {
-                    "age": 50,
-                    "sex": 1,
-                    "cp": 0,
-                    "trestbps": 120,
-                    "chol": 200,
-                    "fbs": 0,
-                    "restecg": 0,
-                    "thalach": 150,
-                    "exang": 0,
-                    "oldpeak": 0.5,
-                    "slope": 1,
-                    "ca": 0,
-                    "thal": 2,
-                }
-            ]
-        )
+        patient = make_patient(BASE_PATIENT)
 
         predictor = MockRiskPredictor(risk_score=35.0)
         recommendation = recommender.recommend(patient, predictor, denormalized_data=patient)
 
         assert "rationale" in recommendation
         # Should mention risk level
-        assert any(keyword in recommendation["rationale"].lower() for keyword in ["risk", "medium", "low", "high", "very"])
+        assert _LEVEL_RE.search(recommendation["rationale"])
 
     def test_rationale_includes_risk_factors(self, recommender):
         """Test that rationale mentions identified risk factors."""
-        patient = pd.DataFrame(
-            [
-                {
-                    "age": 60,
-                    "sex": 1,
-                    "cp": 3,
-                    "trestbps": 165,  # Severe
-                    "chol": 250,  # Moderate
-                    "fbs": 0,
-                    "restecg": 0,
-                    "thalach": 140,
-                    "exang": 1,  # Moderate
-                    "oldpeak": 1.5,
-                    "slope": 2,
-                    "ca": 0,
-                    "thal": 3,
-                }
-            ]
-        )
+        patient = make_patient(RATIONALE_FACTORS_PATIENT)
 
         predictor = MockRiskPredictor(risk_score=45.0)
         recommendation = recommender.recommend(patient, predictor, denormalized_data=patient)
@@ -361,35 +336,15 @@ class TestClinicalRationale:
 
     def test_rationale_includes_intervention_name(self, recommender):
         """Test that rationale includes the recommended intervention."""
-        patient = pd.DataFrame(
-            [
-                {
-                    "age": 50,
-                    "sex": 1,
-                    "cp": 0,
-                    "trestbps": 120,
-                    "chol": 200,
-                    "fbs": 0,
-                    "restecg": 0,
-                    "thalach": 150,
-                    "exang": 0,
-                    "oldpeak": 0.5,
-                    "slope": 1,
-                    "ca": 0,
-                    "thal": 2,
-                }
-            ]
-        )
+        patient = make_patient(BASE_PATIENT)
 
         predictor = MockRiskPredictor(risk_score=35.0)
         recommendation = recommender.recommend(patient, predictor, denormalized_data=patient)
 
         assert "rationale" in recommendation
         # Should mention the intervention name
-        assert recommendation["action_name"].lower() in recommendation["rationale"].lower() or any(
-            word in recommendation["rationale"].lower()
-            for word in ["monitor", "lifestyle", "medication", "combination", "intensive"]
-        )
+        rationale = recommendation["rationale"]
+        assert recommendation["action_name"].lower() in rationale.lower() or _INTERVENTION_RE.search(rationale)
 
 
 class TestAPICompatibility:
@@ -401,25 +356,7 @@ class TestAPICompatibility:
 
     @pytest.fixture
     def sample_patient(self):
-        return pd.DataFrame(
-            [
-                {
-                    "age": 55,
-                    "sex": 1,
-                    "cp": 2,
-                    "trestbps": 145,
-                    "chol": 233,
-                    "fbs": 1,
-                    "restecg": 0,
-                    "thalach": 150,
-                    "exang": 0,
-                    "oldpeak": 2.3,
-                    "slope": 2,
-                    "ca": 0,
-                    "thal": 6,
-                }
-            ]
-        )
+        return make_patient(SAMPLE_PATIENT)
 
     def test_returns_all_required_fields(self, recommender, sample_patient):
         """Test that recommendation includes all required fields."""
@@ -489,25 +426,7 @@ class TestEdgeCases:
 
     def test_threshold_boundaries(self, recommender):
         """Test recommendations at exact threshold boundaries."""
-        patient = pd.DataFrame(
-            [
-                {
-                    "age": 50,
-                    "sex": 1,
-                    "cp": 0,
-                    "trestbps": 120,
-                    "chol": 200,
-                    "fbs": 0,
-                    "restecg": 0,
-                    "thalach": 150,
-                    "exang": 0,
-                    "oldpeak": 0.5,
-                    "slope": 1,
-                    "ca": 0,
-                    "thal": 2,
-                }
-            ]
-        )
+        patient = make_patient(BASE_PATIENT)
 
         # Test at each threshold
         thresholds = [
@@ -9,60 +9,94 @@ Tests cover:
 5. Integration with risk predictor
 """
 
+from itertools import product
+from types import MappingProxyType
+
+import numpy as np
 import pytest
-from fastapi.testclient import TestClient
 
-from api.main import app
 from ml.intervention_utils import ensure_risk_monotonicity
 
+# Under `--dist loadgroup` the whole module runs on one worker, so every class shares the
+# memoised responses of the module-scoped `simulate` and `recommend` fixtures. Ignored under
+# the default `--dist loadscope`, which already keeps each class on one worker.
+pytestmark = pytest.mark.xdist_group(name="intervention_simulation")
+
+# The healthy, unhealthy, moderate- and high-risk patient fixtures are shared from conftest.py.
+# Request payloads take a dict() copy since the JSON encoder does not accept mapping proxies.
+
+SAMPLE_PATIENT = MappingProxyType(
+    {
+        "age": 55,
+        "sex": 1,
+        "cp": 2,
+        "trestbps": 145,
+        "chol": 240,
+        "fbs": 0,
+        "restecg": 0,
+        "thalach": 140,
+        "exang": 0,
+        "oldpeak": 1.0,
+        "slope": 2,
+        "ca": 1,
+        "thal": 3,
+    }
+)
+
+
+@pytest.fixture(scope="module")
+def sample_patient():
+    """Sample patient data"""
+    return SAMPLE_PATIENT
+
+
+@pytest.fixture(scope="module")
+def simulate(client, memoize):
+    """
+    POST a (patient, action) pair to /api/simulate, memoising responses for the module.
 
-class TestInterventionSimulationAPI:
-    """Test the /api/simulate endpoint"""
+    Many tests assert different invariants on the same simulation, so each unique
+    pair is only sent once. Tests that check request handling itself (validation,
+    determinism) post through the client directly.
+    """
+    return memoize(lambda patient, action: client.post("/api/simulate", json={"patient": dict(patient), "action": action}))
 
-    @pytest.fixture
-    def healthy_patient_data(self):
-        """Healthy patient with optimal metrics"""
-        return {
-            "age": 45,
-            "sex": 1,
-            "cp": 1,  # cp must be 1-4
-            "trestbps": 110,
-            "chol": 180,
-            "fbs": 0,
-            "restecg": 0,
-            "thalach": 160,
-            "exang": 0,
-            "oldpeak": 0.0,
-            "slope": 1,
-            "ca": 0,
-            "thal": 3,  # thal must be 3, 6, or 7
-        }
 
-    @pytest.fixture
-    def unhealthy_patient_data(self):
-        """Unhealthy patient with elevated risk factors"""
-        return {
-            "age": 60,
-            "sex": 1,
-            "cp": 3,
-            "trestbps": 160,
-            "chol": 280,
-            "fbs": 1,
-            "restecg": 1,
-            "thalach": 120,
-            "exang": 1,
-            "oldpeak": 2.5,
-            "slope": 2,
-            "ca": 2,
-            "thal": 3,
-        }
+@pytest.fixture(scope="module")
+def recommend(client, memoize):
+    """POST a patient to /api/recommend, memoising responses for the module like `simulate`."""
+    return memoize(lambda patient: client.post("/api/recommend", json=dict(patient)))
+
+
+# Clinically valid ranges for optimized metrics, in CLINICAL_METRICS order
+CLINICAL_METRICS = ("trestbps", "chol", "thalach", "oldpeak")
+CLINICAL_LOWER_BOUNDS = np.array([90, 120, 60, 0.0])
+CLINICAL_UPPER_BOUNDS = np.array([200, 400, 220, 6.0])
+
+# Healthy ranges for blood pressure and cholesterol
+HEALTHY_METRICS = ("trestbps", "chol")
+HEALTHY_LOWER_BOUNDS = np.array([90, 120])
+HEALTHY_UPPER_BOUNDS = np.array([130, 220])
+
+
+def metric_values(metrics, names):
+    """Values of the named metrics as an array, in the given order."""
+    return np.array([metrics[name] for name in names], dtype=float)
+
 
-    def test_monitor_only_no_changes(self, client, healthy_patient_data):
+def metric_reductions(results, metric="trestbps"):
+    """Reduction of a metric (current - optimized) for each simulation result, as an array."""
+    return np.fromiter(
+        (r["current_metrics"][metric] - r["optimized_metrics"][metric] for r in results), dtype=float, count=len(results)
+    )
+
+
+class TestInterventionSimulationAPI:
+    """Test the /api/simulate endpoint"""
+
+    def test_monitor_only_no_changes(self, simulate, healthy_patient):
         """Test that monitor only (action 0) makes no changes"""
-        response = client.post(
-            "/api/simulate",
-            json={"patient": healthy_patient_data, "action": 0},
-        )
+        response = simulate(healthy_patient, 0)
 
         assert response.status_code == 200
         data = response.json()
@@ -71,12 +105,9 @@ class TestInterventionSimulationAPI:
         assert data["current_metrics"] == data["optimized_metrics"]
         assert data["risk_reduction"] == 0.0
 
-    def test_lifestyle_intervention_changes_metrics(self, client, unhealthy_patient_data):
+    def test_lifestyle_intervention_changes_metrics(self, simulate, unhealthy_patient):
         """Test that lifestyle intervention (action 1) changes metrics"""
-        response = client.post(
-            "/api/simulate",
-            json={"patient": unhealthy_patient_data, "action": 1},
-        )
+        response = simulate(unhealthy_patient, 1)
 
         assert response.status_code == 200
         data = response.json()
@@ -85,20 +116,14 @@ class TestInterventionSimulationAPI:
         assert data["optimized_metrics"]["trestbps"] < data["current_metrics"]["trestbps"]
         assert data["optimized_metrics"]["chol"] < data["current_metrics"]["chol"]
 
-    def test_intensive_treatment_stronger_than_lifestyle(self, client, unhealthy_patient_data):
+    def test_intensive_treatment_stronger_than_lifestyle(self, simulate, unhealthy_patient):
         """Test that intensive treatment has stronger effects than lifestyle"""
         # Get lifestyle results
-        lifestyle_response = client.post(
-            "/api/simulate",
-            json={"patient": unhealthy_patient_data, "action": 1},
-        )
+        lifestyle_response = simulate(unhealthy_patient, 1)
         lifestyle_data = lifestyle_response.json()
 
         # Get intensive results
-        intensive_response = client.post(
-            "/api/simulate",
-            json={"patient": unhealthy_patient_data, "action": 4},
-        )
+        intensive_response = simulate(unhealthy_patient, 4)
         intensive_data = intensive_response.json()
 
         # Intensive should have bigger reductions
@@ -111,17 +136,16 @@ class TestInterventionSimulationAPI:
 
         assert intensive_bp_reduction >= lifestyle_bp_reduction
 
-    def test_all_actions_return_valid_response(self, client, unhealthy_patient_data):
+    def test_all_actions_return_valid_response(self, client, unhealthy_patient):
         """Test that all actions (0-4) return valid responses"""
-        for action in range(5):
-            response = client.post(
-                "/api/simulate",
-                json={"patient": unhealthy_patient_data, "action": action},
-            )
+        # Simulate every action in a single batch request
+        response = client.post("/api/simulate/batch", json={"patient": dict(unhealthy_patient), "actions": list(range(5))})
 
-            assert response.status_code == 200
-            data = response.json()
+        assert response.status_code == 200
+        simulations = response.json()["simulations"]
+        assert len(simulations) == 5
 
+        for data in simulations:
             # Check required fields
             assert "current_metrics" in data
             assert "optimized_metrics" in data
@@ -132,7 +156,7 @@ class TestInterventionSimulationAPI:
             # Risk reduction should be non-negative (no paradoxical increases)
             assert data["risk_reduction"] >= 0
 
-    def test_metrics_always_shown_even_with_zero_risk_reduction(self, client, unhealthy_patient_data):
+    def test_metrics_always_shown_even_with_zero_risk_reduction(self, simulate, unhealthy_patient):
         """
         Critical test: Verify that optimized metrics are ALWAYS shown,
         even when risk reduction is 0% due to model artifacts.
@@ -140,10 +164,7 @@ class TestInterventionSimulationAPI:
         This addresses the bug where interventions appeared to have no effect
         because the safeguard was returning unchanged metrics.
         """
-        response = client.post(
-            "/api/simulate",
-            json={"patient": unhealthy_patient_data, "action": 2},  # Single medication
-        )
+        response = simulate(unhealthy_patient, 2)  # Single medication
 
         assert response.status_code == 200
         data = response.json()
@@ -161,87 +182,47 @@ class TestInterventionSimulationAPI:
             assert optimized_bp < current_bp or optimized_bp == current_bp
 
 
-class TestRiskMonotonicitySafeguard:
-    """Test the risk monotonicity safeguard function"""
-
-    def test_risk_decreases_returns_new_metrics(self):
-        """When risk decreases, should return new risk and optimized metrics"""
-        current_risk = 80.0
-        new_risk = 60.0
-        current_metrics = {"trestbps": 160, "chol": 280}
-        optimized_metrics = {"trestbps": 140, "chol": 240}
-
-        final_risk, final_metrics = ensure_risk_monotonicity(
-            current_risk, new_risk, current_metrics, optimized_metrics, action=1
-        )
-
-        assert final_risk == new_risk
-        assert final_metrics == optimized_metrics
-
-    def test_risk_increases_caps_risk_but_shows_metrics(self):
-        """
-        Critical test: When risk paradoxically increases, should:
-        1. Cap risk at current level (prevent paradox)
-        2. STILL show optimized metrics (show intervention effects)
-
-        This is the fix for the bug where interventions showed 0% effect.
-        """
-        current_risk = 60.0
-        new_risk = 65.0  # Paradoxical increase (model artifact)
-        current_metrics = {"trestbps": 160, "chol": 280}
-        optimized_metrics = {"trestbps": 140, "chol": 240}  # Metrics improved
+# Metrics before and after an intervention, shared by the safeguard cases
+SAFEGUARD_CURRENT_METRICS = MappingProxyType({"trestbps": 160, "chol": 280})
+SAFEGUARD_OPTIMIZED_METRICS = MappingProxyType({"trestbps": 140, "chol": 240})
 
-        final_risk, final_metrics = ensure_risk_monotonicity(
-            current_risk, new_risk, current_metrics, optimized_metrics, action=1
-        )
+# (current risk, new risk, action, expected final risk, whether optimized metrics are shown)
+SAFEGUARD_CASES = [
+    # Risk decreases: new risk and optimized metrics are returned
+    pytest.param(80.0, 60.0, 1, 60.0, True, id="risk_decreases"),
+    # Monitor only (action 0) always returns the unchanged state
+    pytest.param(60.0, 50.0, 0, 60.0, False, id="monitor_only"),
+    # Paradoxical increase (model artifact) under every intervention: risk is capped at the
+    # current level, but the optimized metrics are STILL shown (the fix for interventions
+    # appearing to have 0% effect)
+    *[
+        pytest.param(60.0, new_risk, action, 60.0, True, id=f"increase_to_{new_risk:.0f}_action_{action}")
+        for new_risk, action in product((65.0, 70.0), range(1, 5))
+    ],
+]
 
-        # Risk should be capped at current level
-        assert final_risk == current_risk
 
-        # BUT metrics should still show the improvements (THIS IS THE FIX!)
-        assert final_metrics == optimized_metrics
-        assert final_metrics != current_metrics
+class TestRiskMonotonicitySafeguard:
+    """Test the risk monotonicity safeguard function"""
 
-    def test_monitor_only_returns_unchanged(self):
-        """Monitor only (action 0) should always return unchanged state"""
-        current_risk = 60.0
-        new_risk = 50.0
-        current_metrics = {"trestbps": 160, "chol": 280}
-        optimized_metrics = {"trestbps": 140, "chol": 240}
+    @pytest.mark.parametrize("current_risk,new_risk,action,expected_risk,shows_optimized", SAFEGUARD_CASES)
+    def test_safeguard(self, current_risk, new_risk, action, expected_risk, shows_optimized):
+        """Risk never increases, and optimized metrics are shown for every real intervention"""
+        current_metrics = dict(SAFEGUARD_CURRENT_METRICS)
+        optimized_metrics = dict(SAFEGUARD_OPTIMIZED_METRICS)
 
         final_risk, final_metrics = ensure_risk_monotonicity(
-            current_risk, new_risk, current_metrics, optimized_metrics, action=0
+            current_risk, new_risk, current_metrics, optimized_metrics, action=action
         )
 
-        assert final_risk == current_risk
-        assert final_metrics == current_metrics
-
-    def test_all_intervention_actions_prevent_risk_increase(self):
-        """All intervention actions (1-4) should prevent risk increases"""
-        current_risk = 60.0
-        new_risk = 70.0  # Paradoxical increase
-        current_metrics = {"trestbps": 160, "chol": 280}
-        optimized_metrics = {"trestbps": 140, "chol": 240}
-
-        for action in range(1, 5):
-            final_risk, final_metrics = ensure_risk_monotonicity(
-                current_risk, new_risk, current_metrics, optimized_metrics, action=action
-            )
-
-            # Risk should never increase
-            assert final_risk <= current_risk
-            # Metrics should always show optimized values
-            assert final_metrics == optimized_metrics
+        assert final_risk == expected_risk
+        assert final_risk <= current_risk
+        assert final_metrics == (optimized_metrics if shows_optimized else current_metrics)
 
 
 class TestInterventionErrorHandling:
     """Test error handling in intervention simulation"""
 
-    @pytest.fixture
-    def client(self):
-        """Create test client"""
-        return TestClient(app)
-
     def test_malformed_patient_data_rejected(self, client):
         """Test that malformed patient data is rejected"""
         response = client.post(
@@ -270,110 +251,9 @@ class TestInterventionErrorHandling:
 class TestReasonableRiskReductions:
     """Test that interventions produce reasonable, expected risk reductions"""
 
-    @pytest.fixture
-    def healthy_patient(self):
-        """
-        Healthy patient with optimal metrics who should NOT receive aggressive treatment.
-
-        Clinical Profile:
-        - Young age (45)
-        - Optimal BP (110 mmHg)
-        - Optimal cholesterol (180 mg/dL)
-        - Good exercise capacity (thalach=160, exang=0, oldpeak=0)
-        - No cardiac abnormalities
-
-        Expected Recommendations:
-        - Monitor Only (action 0) or Lifestyle (action 1) for primary prevention
-        - Should NOT receive medications due to low risk
-        """
-        return {
-            "age": 45,
-            "sex": 1,
-            "cp": 1,  # Typical angina
-            "trestbps": 110,  # Optimal BP
-            "chol": 180,  # Optimal cholesterol
-            "fbs": 0,
-            "restecg": 0,
-            "thalach": 160,  # Good max heart rate
-            "exang": 0,  # No exercise-induced angina
-            "oldpeak": 0.0,  # No ST depression
-            "slope": 1,
-            "ca": 0,
-            "thal": 3,  # Normal
-        }
-
-    @pytest.fixture
-    def high_risk_patient(self):
-        """
-        High-risk patient who should benefit significantly from intensive interventions.
-
-        Clinical Profile:
-        - Older age (65)
-        - Severe hypertension (170 mmHg)
-        - Severe hyperlipidemia (300 mg/dL)
-        - Poor exercise capacity (thalach=110, exang=1, oldpeak=3.0)
-        - Multiple cardiac abnormalities (ca=2, thal=7)
-
-        Expected Recommendations:
-        - Combination Therapy (action 3) or Intensive Treatment (action 4)
-        - Medications are clinically indicated due to high risk
-        - Should see significant improvements in BP, cholesterol, and cardiac metrics
-        """
-        return {
-            "age": 65,
-            "sex": 1,
-            "cp": 4,  # Asymptomatic
-            "trestbps": 170,  # High BP
-            "chol": 300,  # High cholesterol
-            "fbs": 1,
-            "restecg": 1,
-            "thalach": 110,  # Low max heart rate
-            "exang": 1,  # Exercise-induced angina
-            "oldpeak": 3.0,  # Significant ST depression
-            "slope": 2,
-            "ca": 2,
-            "thal": 7,  # Reversible defect
-        }
-
-    @pytest.fixture
-    def moderate_risk_patient(self):
-        """
-        Moderate-risk patient with some elevated risk factors.
-
-        Clinical Profile:
-        - Middle age (55)
-        - Stage 1 hypertension (150 mmHg)
-        - Borderline high cholesterol (250 mg/dL)
-        - Moderate exercise capacity (thalach=135, exang=0, oldpeak=1.5)
-        - Some cardiac abnormalities (ca=1)
-
-        Expected Recommendations:
-        - Lifestyle Intervention (action 1) or Single Medication (action 2)
-        - Initial lifestyle modification, medication if no improvement
-        - Should see moderate improvements in BP and cholesterol
-        """
-        return {
-            "age": 55,
-            "sex": 1,
-            "cp": 3,
-            "trestbps": 150,  # Moderately high BP
-            "chol": 250,  # Moderately high cholesterol
-            "fbs": 0,
-            "restecg": 0,
-            "thalach": 135,  # Moderate max heart rate
-            "exang": 0,
-            "oldpeak": 1.5,
-            "slope": 2,
-            "ca": 1,
-            "thal": 3,
-        }
-
-    def test_high_risk_patient_benefits_from_intensive_treatment(self, client, high_risk_patient):
+    def test_high_risk_patient_benefits_from_intensive_treatment(self, simulate, high_risk_patient):
         """High-risk patients should see meaningful risk reduction from intensive treatment"""
-        response = client.post(
-            "/api/simulate",
-            json={"patient": high_risk_patient, "action": 4},  # Intensive treatment
-        )
+        response = simulate(high_risk_patient, 4)  # Intensive treatment
 
         assert response.status_code == 200
         data = response.json()
@@ -388,16 +268,10 @@ class TestReasonableRiskReductions:
         assert data["optimized_metrics"]["trestbps"] < data["current_metrics"]["trestbps"]
         assert data["optimized_metrics"]["chol"] < data["current_metrics"]["chol"]
 
-    def test_lifestyle_provides_smaller_reduction_than_intensive(self, client, high_risk_patient):
+    def test_lifestyle_provides_smaller_reduction_than_intensive(self, simulate, high_risk_patient):
         """Lifestyle intervention should provide smaller reductions than intensive treatment"""
-        lifestyle_response = client.post(
-            "/api/simulate",
-            json={"patient": high_risk_patient, "action": 1},  # Lifestyle
-        )
-        intensive_response = client.post(
-            "/api/simulate",
-            json={"patient": high_risk_patient, "action": 4},  # Intensive
-        )
+        lifestyle_response = simulate(high_risk_patient, 1)  # Lifestyle
+        intensive_response = simulate(high_risk_patient, 4)  # Intensive
 
         lifestyle_data = lifestyle_response.json()
         intensive_data = intensive_response.json()
@@ -421,7 +295,7 @@ class TestReasonableRiskReductions:
         # (Allow small tolerance due to model non-linearity)
         assert intensive_data["risk_reduction"] >= lifestyle_data["risk_reduction"] - 0.5
 
-    def test_single_medication_between_lifestyle_and_combo(self, client, moderate_risk_patient):
+    def test_single_medication_between_lifestyle_and_combo(self, simulate, moderate_risk_patient):
         """
         Single medication should provide effects between lifestyle and combination therapy.
 
@@ -429,49 +303,24 @@ class TestReasonableRiskReductions:
         depends on which features the model weighs most heavily. If structural factors
         dominate, risk reduction may be modest across all interventions.
         """
-        lifestyle_response = client.post(
-            "/api/simulate",
-            json={"patient": moderate_risk_patient, "action": 1},
-        )
-        single_med_response = client.post(
-            "/api/simulate",
-            json={"patient": moderate_risk_patient, "action": 2},
-        )
-        combo_response = client.post(
-            "/api/simulate",
-            json={"patient": moderate_risk_patient, "action": 3},
-        )
-
-        lifestyle_data = lifestyle_response.json()
-        single_med_data = single_med_response.json()
-        combo_data = combo_response.json()
+        results = [simulate(moderate_risk_patient, action).json() for action in (1, 2, 3)]
 
-        # Calculate BP improvements (metric changes should be monotonic)
-        lifestyle_bp = lifestyle_data["current_metrics"]["trestbps"] - lifestyle_data["optimized_metrics"]["trestbps"]
-        single_med_bp = single_med_data["current_metrics"]["trestbps"] - single_med_data["optimized_metrics"]["trestbps"]
-        combo_bp = combo_data["current_metrics"]["trestbps"] - combo_data["optimized_metrics"]["trestbps"]
-
-        # BP reductions should be monotonic (more intensive = more reduction)
-        assert single_med_bp >= lifestyle_bp - 1  # Allow small margin for rounding
-        assert combo_bp >= single_med_bp - 1  # Allow small margin for rounding
+        # BP reductions should be monotonic (more intensive = more reduction),
+        # allowing a small margin for rounding
+        bp_reductions = metric_reductions(results)
+        assert np.all(np.diff(bp_reductions) >= -1), f"BP reductions should not drop with intensity: {bp_reductions}"
 
         # Risk reductions may NOT be monotonic due to feature importance
         # (structural factors may dominate), so we only check they're non-negative
-        assert lifestyle_data["risk_reduction"] >= 0
-        assert single_med_data["risk_reduction"] >= 0
-        assert combo_data["risk_reduction"] >= 0
+        assert all(r["risk_reduction"] >= 0 for r in results)
 
     def test_interventions_produce_positive_or_zero_risk_reduction(self, client, high_risk_patient):
         """All interventions should reduce or maintain risk, never increase it"""
-        for action in range(1, 5):  # Actions 1-4 (skip monitor-only)
-            response = client.post(
-                "/api/simulate",
-                json={"patient": high_risk_patient, "action": action},
-            )
-
-            assert response.status_code == 200
-            data = response.json()
+        actions = list(range(1, 5))  # Actions 1-4 (skip monitor-only)
+        response = client.post("/api/simulate/batch", json={"patient": dict(high_risk_patient), "actions": actions})
 
+        assert response.status_code == 200
+        for action, data in zip(actions, response.json()["simulations"]):
             # Risk reduction should never be negative (risk should never increase)
             assert data["risk_reduction"] >= 0, f"Action {action} caused risk increase: {data['risk_reduction']}"
 
@@ -480,12 +329,9 @@ class TestReasonableRiskReductions:
                 data["expected_risk"] <= data["current_risk"]
             ), f"Action {action} increased risk from {data['current_risk']} to {data['expected_risk']}"
 
-    def test_metrics_show_expected_clinical_improvements(self, client, high_risk_patient):
+    def test_metrics_show_expected_clinical_improvements(self, simulate, high_risk_patient):
         """Test that metric changes align with clinical expectations"""
-        response = client.post(
-            "/api/simulate",
-            json={"patient": high_risk_patient, "action": 3},  # Combination therapy
-        )
+        response = simulate(high_risk_patient, 3)  # Combination therapy
 
         data = response.json()
         current = data["current_metrics"]
@@ -501,10 +347,26 @@ class TestReasonableRiskReductions:
             assert optimized["chol"] < current["chol"], "Cholesterol should decrease for hyperlipidemic patient"
 
         # 3. Metrics should stay within clinical bounds
-        assert 90 <= optimized["trestbps"] <= 200, "BP should stay in valid range"
-        assert 120 <= optimized["chol"] <= 400, "Cholesterol should stay in valid range"
-        assert 60 <= optimized["thalach"] <= 220, "Max heart rate should stay in valid range"
-        assert 0 <= optimized["oldpeak"] <= 6, "ST depression should stay in valid range"
+        values = metric_values(optimized, CLINICAL_METRICS)
+        assert np.all(
+            (CLINICAL_LOWER_BOUNDS <= values) & (values <= CLINICAL_UPPER_BOUNDS)
+        ), f"Metrics should stay in valid ranges, got {dict(zip(CLINICAL_METRICS, values))}"
+
+
+# Minimum BP (mmHg) and cholesterol (mg/dL) reductions per (patient, action). Typical
+# reductions: lifestyle (diet, exercise) BP 5-10 / cholesterol 10-20; single medication
+# (statin or ACE inhibitor) BP 10-15 / cholesterol 15-30%; combination therapy BP 15-20 /
+# cholesterol 20-30%; intensive treatment BP 20-30 / cholesterol 25-40%. High-risk patients
+# start further from target (170 mmHg, 300 mg/dL) and so see larger absolute reductions.
+METRIC_REDUCTION_CASES = [
+    pytest.param("moderate_risk_patient", 1, 5, 10, id="moderate-lifestyle"),
+    pytest.param("moderate_risk_patient", 2, 7, 15, id="moderate-single_medication"),
+    pytest.param("moderate_risk_patient", 3, 10, 20, id="moderate-combination_therapy"),
+    pytest.param("moderate_risk_patient", 4, 15, 25, id="moderate-intensive"),
+    pytest.param("high_risk_patient", 2, 10, 20, id="high-single_medication"),
+    pytest.param("high_risk_patient", 3, 15, 30, id="high-combination_therapy"),
+    pytest.param("high_risk_patient", 4, 25, 60, id="high-intensive"),
+]
 
 
 class TestComprehensiveTreatmentEffects:
@@ -518,83 +380,31 @@ class TestComprehensiveTreatmentEffects:
     4. The system can explain why specific treatments are recommended
     """
 
-    @pytest.fixture
-    def healthy_patient(self):
-        """Low-risk patient with optimal health metrics"""
-        return {
-            "age": 45,
-            "sex": 1,
-            "cp": 1,
-            "trestbps": 110,
-            "chol": 180,
-            "fbs": 0,
-            "restecg": 0,
-            "thalach": 160,
-            "exang": 0,
-            "oldpeak": 0.0,
-            "slope": 1,
-            "ca": 0,
-            "thal": 3,
-        }
-
-    @pytest.fixture
-    def moderate_risk_patient(self):
-        """Moderate-risk patient with some elevated risk factors"""
-        return {
-            "age": 55,
-            "sex": 1,
-            "cp": 3,
-            "trestbps": 150,
-            "chol": 250,
-            "fbs": 0,
-            "restecg": 0,
-            "thalach": 135,
-            "exang": 0,
-            "oldpeak": 1.5,
-            "slope": 2,
-            "ca": 1,
-            "thal": 3,
-        }
-
-    @pytest.fixture
-    def high_risk_patient(self):
-        """High-risk patient with multiple severe risk factors"""
-        return {
-            "age": 65,
-            "sex": 1,
-            "cp": 4,
-            "trestbps": 170,
-            "chol": 300,
-            "fbs": 1,
-            "restecg": 1,
-            "thalach": 110,
-            "exang": 1,
-            "oldpeak": 3.0,
-            "slope": 2,
-            "ca": 2,
-            "thal": 7,
-        }
-
-    # ========================================
-    # HEALTHY PATIENT × ALL TREATMENTS
-    # ========================================
-
-    def test_healthy_patient_monitor_only(self, client, healthy_patient):
+    @pytest.mark.parametrize(
+        "patient_fixture",
+        ["healthy_patient", "moderate_risk_patient", "high_risk_patient"],
+        ids=["healthy", "moderate", "high"],
+    )
+    def test_monitor_only_leaves_patient_unchanged(self, request, simulate, patient_fixture):
         """
-        Healthy patient + Monitor Only: Should remain unchanged.
+        Any patient + Monitor Only: No changes.
 
-        Rationale: Already at optimal health, no intervention needed.
+        Rationale: Monitor only means no intervention, even for high-risk patients
+        (for whom the AI should NOT recommend it).
         Expected: All metrics unchanged, 0% risk reduction.
         """
-        response = client.post("/api/simulate", json={"patient": healthy_patient, "action": 0})
+        response = simulate(request.getfixturevalue(patient_fixture), 0)
         data = response.json()
 
-        # Verify no changes
+        assert response.status_code == 200
         assert data["current_metrics"] == data["optimized_metrics"]
         assert data["risk_reduction"] == 0.0
-        assert response.status_code == 200
 
-    def test_healthy_patient_lifestyle(self, client, healthy_patient):
+    # ========================================
+    # HEALTHY PATIENT × ALL TREATMENTS
+    # ========================================
+
+    def test_healthy_patient_lifestyle(self, simulate, healthy_patient):
         """
         Healthy patient + Lifestyle: Minimal changes (already optimal).
 
@@ -602,7 +412,7 @@ class TestComprehensiveTreatmentEffects:
         shouldn't dramatically change already-healthy metrics.
         Expected: Small or no changes to metrics (adaptive logic prevents over-optimization).
         """
-        response = client.post("/api/simulate", json={"patient": healthy_patient, "action": 1})
+        response = simulate(healthy_patient, 1)
         data = response.json()
 
         current = data["current_metrics"]
@@ -620,7 +430,7 @@ class TestComprehensiveTreatmentEffects:
         # Risk should not increase
         assert data["risk_reduction"] >= 0
 
-    def test_healthy_patient_single_medication(self, client, healthy_patient):
+    def test_healthy_patient_single_medication(self, simulate, healthy_patient):
         """
         Healthy patient + Single Medication: Should show some effect but limited benefit.
 
@@ -628,7 +438,7 @@ class TestComprehensiveTreatmentEffects:
         prevents unnecessary reduction of already-optimal metrics.
         Expected: Some BP/cholesterol reduction, but modest since starting values are optimal.
         """
-        response = client.post("/api/simulate", json={"patient": healthy_patient, "action": 2})
+        response = simulate(healthy_patient, 2)
         data = response.json()
 
         current = data["current_metrics"]
@@ -642,7 +452,7 @@ class TestComprehensiveTreatmentEffects:
         assert optimized["trestbps"] >= 90, "BP should not go too low"
         assert data["risk_reduction"] >= 0
 
-    def test_healthy_patient_combination_therapy(self, client, healthy_patient):
+    def test_healthy_patient_combination_therapy(self, simulate, healthy_patient):
         """
         Healthy patient + Combination Therapy: Similar to single medication.
 
@@ -650,7 +460,7 @@ class TestComprehensiveTreatmentEffects:
         much additional benefit over single medication.
         Expected: Modest changes, metrics stay in healthy range.
         """
-        response = client.post("/api/simulate", json={"patient": healthy_patient, "action": 3})
+        response = simulate(healthy_patient, 3)
         data = response.json()
 
         current = data["current_metrics"]
@@ -661,11 +471,11 @@ class TestComprehensiveTreatmentEffects:
         assert optimized["chol"] <= current["chol"]
 
         # Should stay in healthy ranges
-        assert 90 <= optimized["trestbps"] <= 130
-        assert 120 <= optimized["chol"] <= 220
+        values = metric_values(optimized, HEALTHY_METRICS)
+        assert np.all((HEALTHY_LOWER_BOUNDS <= values) & (values <= HEALTHY_UPPER_BOUNDS))
         assert data["risk_reduction"] >= 0
 
-    def test_healthy_patient_intensive_treatment(self, client, healthy_patient):
+    def test_healthy_patient_intensive_treatment(self, simulate, healthy_patient):
         """
         Healthy patient + Intensive Treatment: Maximal intervention effects.
 
@@ -673,7 +483,7 @@ class TestComprehensiveTreatmentEffects:
         but benefits are limited when starting from optimal baseline.
         Expected: Some reduction in metrics, but limited clinical benefit.
         """
-        response = client.post("/api/simulate", json={"patient": healthy_patient, "action": 4})
+        response = simulate(healthy_patient, 4)
         data = response.json()
 
         current = data["current_metrics"]
@@ -684,145 +494,32 @@ class TestComprehensiveTreatmentEffects:
         assert optimized["chol"] <= current["chol"]
 
         # Should stay above minimum safe values
-        assert optimized["trestbps"] >= 90
-        assert optimized["chol"] >= 120
+        assert np.all(metric_values(optimized, HEALTHY_METRICS) >= HEALTHY_LOWER_BOUNDS)
         assert data["risk_reduction"] >= 0
 
     # ========================================
-    # MODERATE-RISK PATIENT × ALL TREATMENTS
+    # MODERATE- AND HIGH-RISK PATIENTS × ALL TREATMENTS
     # ========================================
 
-    def test_moderate_patient_monitor_only(self, client, moderate_risk_patient):
-        """
-        Moderate-risk patient + Monitor Only: No changes.
-
-        Rationale: Monitor only means no intervention.
-        Expected: All metrics unchanged, 0% risk reduction.
-        """
-        response = client.post("/api/simulate", json={"patient": moderate_risk_patient, "action": 0})
-        data = response.json()
-
-        assert data["current_metrics"] == data["optimized_metrics"]
-        assert data["risk_reduction"] == 0.0
-
-    def test_moderate_patient_lifestyle(self, client, moderate_risk_patient):
-        """
-        Moderate-risk patient + Lifestyle: Meaningful but modest improvements.
-
-        Rationale: Lifestyle changes (diet, exercise) can reduce BP by 5-10 mmHg
-        and cholesterol by 10-20 mg/dL. Patient has room for improvement.
-        Expected: BP reduction ~5-10 mmHg, cholesterol reduction ~10-25 mg/dL.
-        """
-        response = client.post("/api/simulate", json={"patient": moderate_risk_patient, "action": 1})
-        data = response.json()
+    @pytest.mark.parametrize("patient_fixture,action,min_bp_reduction,min_chol_reduction", METRIC_REDUCTION_CASES)
+    def test_minimum_metric_reductions(self, request, simulate, patient_fixture, action, min_bp_reduction, min_chol_reduction):
+        """Each treatment reduces elevated BP and cholesterol by at least its clinically expected amount"""
+        data = simulate(request.getfixturevalue(patient_fixture), action).json()
 
         current = data["current_metrics"]
         optimized = data["optimized_metrics"]
-
-        # Should see meaningful reductions
         bp_reduction = current["trestbps"] - optimized["trestbps"]
         chol_reduction = current["chol"] - optimized["chol"]
 
-        assert bp_reduction > 0, "Lifestyle should reduce elevated BP"
-        assert chol_reduction > 0, "Lifestyle should reduce elevated cholesterol"
-
-        # Expect at least 5 mmHg BP reduction (5% of 150 = 7.5)
-        assert bp_reduction >= 5, f"Expected ≥5 mmHg BP reduction, got {bp_reduction}"
-
-        # Expect at least 10 mg/dL cholesterol reduction (10% of 250 = 25)
-        assert chol_reduction >= 10, f"Expected ≥10 mg/dL cholesterol reduction, got {chol_reduction}"
-
-        assert data["risk_reduction"] >= 0
-
-    def test_moderate_patient_single_medication(self, client, moderate_risk_patient):
-        """
-        Moderate-risk patient + Single Medication: Moderate to strong improvements.
-
-        Rationale: Single medication (e.g., statin or ACE inhibitor) typically
-        reduces BP by 10-15 mmHg and cholesterol by 15-30%.
-        Expected: BP reduction ~10-15 mmHg, cholesterol reduction ~37-50 mg/dL.
-        """
-        response = client.post("/api/simulate", json={"patient": moderate_risk_patient, "action": 2})
-        data = response.json()
-
-        current = data["current_metrics"]
-        optimized = data["optimized_metrics"]
-
-        bp_reduction = current["trestbps"] - optimized["trestbps"]
-        chol_reduction = current["chol"] - optimized["chol"]
-
-        # Single medication should be more effective than lifestyle
-        assert bp_reduction >= 7, f"Single med should give ≥7 mmHg BP reduction, got {bp_reduction}"
-        assert chol_reduction >= 15, f"Single med should give ≥15 mg/dL cholesterol reduction, got {chol_reduction}"
-
-        # Should see some risk reduction
-        assert data["risk_reduction"] >= 0
-
-    def test_moderate_patient_combination_therapy(self, client, moderate_risk_patient):
-        """
-        Moderate-risk patient + Combination Therapy: Strong improvements.
-
-        Rationale: Combination therapy (medication + lifestyle) provides additive
-        benefits. Typical reductions: BP 15-20 mmHg, cholesterol 20-30%.
-        Expected: BP reduction ~15-22 mmHg, cholesterol reduction ~50-75 mg/dL.
-        """
-        response = client.post("/api/simulate", json={"patient": moderate_risk_patient, "action": 3})
-        data = response.json()
-
-        current = data["current_metrics"]
-        optimized = data["optimized_metrics"]
-
-        bp_reduction = current["trestbps"] - optimized["trestbps"]
-        chol_reduction = current["chol"] - optimized["chol"]
-
-        # Combination should be stronger than single medication
-        assert bp_reduction >= 10, f"Combo therapy should give ≥10 mmHg BP reduction, got {bp_reduction}"
-        assert chol_reduction >= 20, f"Combo therapy should give ≥20 mg/dL cholesterol reduction, got {chol_reduction}"
-
-        assert data["risk_reduction"] >= 0
-
-    def test_moderate_patient_intensive_treatment(self, client, moderate_risk_patient):
-        """
-        Moderate-risk patient + Intensive Treatment: Maximum improvements.
-
-        Rationale: Intensive treatment (multiple medications + supervised lifestyle)
-        provides strongest effects. Typical reductions: BP 20-30 mmHg, cholesterol 25-40%.
-        Expected: BP reduction ~20-30 mmHg, cholesterol reduction ~62-100 mg/dL.
-        """
-        response = client.post("/api/simulate", json={"patient": moderate_risk_patient, "action": 4})
-        data = response.json()
-
-        current = data["current_metrics"]
-        optimized = data["optimized_metrics"]
-
-        bp_reduction = current["trestbps"] - optimized["trestbps"]
-        chol_reduction = current["chol"] - optimized["chol"]
-
-        # Intensive should provide strongest effects
-        assert bp_reduction >= 15, f"Intensive should give ≥15 mmHg BP reduction, got {bp_reduction}"
-        assert chol_reduction >= 25, f"Intensive should give ≥25 mg/dL cholesterol reduction, got {chol_reduction}"
+        assert bp_reduction >= min_bp_reduction, f"Expected ≥{min_bp_reduction} mmHg BP reduction, got {bp_reduction}"
+        assert (
+            chol_reduction >= min_chol_reduction
+        ), f"Expected ≥{min_chol_reduction} mg/dL cholesterol reduction, got {chol_reduction}"
 
-        # Should see meaningful risk reduction
+        # Risk should never increase
         assert data["risk_reduction"] >= 0
 
-    # ========================================
-    # HIGH-RISK PATIENT × ALL TREATMENTS
-    # ========================================
-
-    def test_high_risk_patient_monitor_only(self, client, high_risk_patient):
-        """
-        High-risk patient + Monitor Only: No changes (but clinically inappropriate).
-
-        Rationale: Monitor only provides no intervention, even for high-risk patients.
-        Expected: No changes, but AI should NOT recommend this for high-risk patients.
-        """
-        response = client.post("/api/simulate", json={"patient": high_risk_patient, "action": 0})
-        data = response.json()
-
-        assert data["current_metrics"] == data["optimized_metrics"]
-        assert data["risk_reduction"] == 0.0
-
-    def test_high_risk_patient_lifestyle(self, client, high_risk_patient):
+    def test_high_risk_patient_lifestyle(self, simulate, high_risk_patient):
         """
         High-risk patient + Lifestyle: Some improvement but insufficient.
 
@@ -830,7 +527,7 @@ class TestComprehensiveTreatmentEffects:
         with severe hypertension (170 mmHg) and hyperlipidemia (300 mg/dL).
         Expected: Small improvements, but not enough to normalize metrics.
         """
-        response = client.post("/api/simulate", json={"patient": high_risk_patient, "action": 1})
+        response = simulate(high_risk_patient, 1)
         data = response.json()
 
         current = data["current_metrics"]
@@ -847,7 +544,7 @@ class TestComprehensiveTreatmentEffects:
         assert optimized["trestbps"] > 130, "Lifestyle alone shouldn't normalize severe hypertension"
         assert optimized["chol"] > 220, "Lifestyle alone shouldn't normalize severe hyperlipidemia"
 
-    def test_high_risk_patient_single_medication(self, client, high_risk_patient):
+    def test_high_risk_patient_single_medication_explains_limited_benefit(self, simulate, high_risk_patient):
         """
         High-risk patient + Single Medication: Meaningful metric improvement but limited risk reduction.
 
@@ -855,24 +552,9 @@ class TestComprehensiveTreatmentEffects:
         single medication reduces BP and cholesterol but may have minimal impact on overall risk because
         the MODEL's primary risk drivers are structural factors (thal, ca, cp) that cannot be modified.
 
-        Expected: Significant BP/cholesterol reductions, but risk reduction may be small (<5%)
-        due to dominance of non-modifiable structural factors in the ML model.
+        Expected: risk reduction may be small (<5%), and the explanation should then say why.
         """
-        response = client.post("/api/simulate", json={"patient": high_risk_patient, "action": 2})
-        data = response.json()
-
-        current = data["current_metrics"]
-        optimized = data["optimized_metrics"]
-
-        bp_reduction = current["trestbps"] - optimized["trestbps"]
-        chol_reduction = current["chol"] - optimized["chol"]
-
-        # Should see meaningful metric reductions
-        assert bp_reduction >= 10, f"Single med should give ≥10 mmHg BP reduction, got {bp_reduction}"
-        assert chol_reduction >= 20, f"Single med should give ≥20 mg/dL cholesterol reduction, got {chol_reduction}"
-
-        # Risk reduction may be minimal due to structural disease
-        assert data["risk_reduction"] >= 0, "Risk should not increase"
+        data = simulate(high_risk_patient, 2).json()
 
         # Verify explanation addresses this
         if "explanation" in data:
@@ -882,53 +564,15 @@ class TestComprehensiveTreatmentEffects:
                     "structural" in data["explanation"].lower() or "cannot be modified" in data["explanation"].lower()
                 ), "Explanation should address why risk reduction is limited"
 
-    def test_high_risk_patient_combination_therapy(self, client, high_risk_patient):
-        """
-        High-risk patient + Combination Therapy: Strong improvements, clinically appropriate.
-
-        Rationale: Combination therapy is standard of care for high-risk patients.
-        Should achieve significant reductions toward treatment goals.
-        Expected: BP reduction 20-30 mmHg, cholesterol reduction 50-80 mg/dL.
-        """
-        response = client.post("/api/simulate", json={"patient": high_risk_patient, "action": 3})
-        data = response.json()
-
-        current = data["current_metrics"]
-        optimized = data["optimized_metrics"]
-
-        bp_reduction = current["trestbps"] - optimized["trestbps"]
-        chol_reduction = current["chol"] - optimized["chol"]
-
-        # Should see strong reductions
-        assert bp_reduction >= 15, f"Combo therapy should give ≥15 mmHg BP reduction, got {bp_reduction}"
-        assert chol_reduction >= 30, f"Combo therapy should give ≥30 mg/dL cholesterol reduction, got {chol_reduction}"
-
-        # Should see meaningful risk reduction
-        assert data["risk_reduction"] >= 0
-
-    def test_high_risk_patient_intensive_treatment(self, client, high_risk_patient):
+    def test_high_risk_patient_intensive_treatment_approaches_goals(self, simulate, high_risk_patient):
         """
         High-risk patient + Intensive Treatment: Maximum improvements, optimal choice.
 
         Rationale: Intensive treatment is most appropriate for severe, multi-factorial
         cardiovascular disease. Should achieve maximal risk reduction.
-        Expected: BP reduction ≥25 mmHg, cholesterol reduction ≥60 mg/dL, significant risk reduction.
+        Expected: Optimized metrics move well toward treatment goals.
         """
-        response = client.post("/api/simulate", json={"patient": high_risk_patient, "action": 4})
-        data = response.json()
-
-        current = data["current_metrics"]
-        optimized = data["optimized_metrics"]
-
-        bp_reduction = current["trestbps"] - optimized["trestbps"]
-        chol_reduction = current["chol"] - optimized["chol"]
-
-        # Should see maximal reductions
-        assert bp_reduction >= 25, f"Intensive should give ≥25 mmHg BP reduction, got {bp_reduction}"
-        assert chol_reduction >= 60, f"Intensive should give ≥60 mg/dL cholesterol reduction, got {chol_reduction}"
-
-        # Should see substantial risk reduction
-        assert data["risk_reduction"] >= 0
+        optimized = simulate(high_risk_patient, 4).json()["optimized_metrics"]
 
         # Optimized metrics should approach treatment goals
         assert optimized["trestbps"] < 160, "Intensive treatment should significantly lower BP"
@@ -939,7 +583,7 @@ class TestComprehensiveTreatmentEffects:
     # ========================================
 
     def test_treatment_effect_scales_with_baseline_severity(
-        self, client, healthy_patient, moderate_risk_patient, high_risk_patient
+        self, simulate, healthy_patient, moderate_risk_patient, high_risk_patient
     ):
         """
         Test that treatment effects are proportional to baseline severity.
@@ -951,8 +595,8 @@ class TestComprehensiveTreatmentEffects:
         action = 3  # Combination therapy
 
         # Get responses for all three patients
-        moderate_response = client.post("/api/simulate", json={"patient": moderate_risk_patient, "action": action})
-        high_risk_response = client.post("/api/simulate", json={"patient": high_risk_patient, "action": action})
+        moderate_response = simulate(moderate_risk_patient, action)
+        high_risk_response = simulate(high_risk_patient, action)
 
         moderate_data = moderate_response.json()
         high_risk_data = high_risk_response.json()
@@ -977,33 +621,28 @@ class TestComprehensiveTreatmentEffects:
             high_risk_chol_reduction >= moderate_chol_reduction
         ), f"High-risk patient should benefit more: {high_risk_chol_reduction} vs {moderate_chol_reduction}"
 
-    def test_treatment_intensity_ordering_for_each_patient_type(
-        self, client, healthy_patient, moderate_risk_patient, high_risk_patient
-    ):
+    @pytest.mark.parametrize(
+        "patient_fixture",
+        ["healthy_patient", "moderate_risk_patient", "high_risk_patient", "sample_patient"],
+        ids=["healthy", "moderate", "high", "sample"],
+    )
+    def test_treatment_intensity_ordering_for_each_patient_type(self, request, client, patient_fixture):
         """
         Test that more intensive treatments produce stronger effects for each patient type.
 
         Rationale: Within each patient, action 4 > action 3 > action 2 > action 1 > action 0.
         Expected: Monotonic increase in effect with treatment intensity.
         """
-        for patient_name, patient_data in [
-            ("Healthy", healthy_patient),
-            ("Moderate-Risk", moderate_risk_patient),
-            ("High-Risk", high_risk_patient),
-        ]:
-            bp_reductions = []
-            for action in range(1, 5):  # Actions 1-4
-                response = client.post("/api/simulate", json={"patient": patient_data, "action": action})
-                data = response.json()
-                bp_reduction = data["current_metrics"]["trestbps"] - data["optimized_metrics"]["trestbps"]
-                bp_reductions.append(bp_reduction)
-
-            # More intensive treatments should have equal or greater effect
-            for i in range(len(bp_reductions) - 1):
-                assert bp_reductions[i + 1] >= bp_reductions[i] - 1, (
-                    f"{patient_name}: Treatment {i+2} should be ≥ Treatment {i+1} "
-                    f"(got {bp_reductions[i+1]:.1f} vs {bp_reductions[i]:.1f})"
-                )
+        # All four treatments in one batch request
+        patient = request.getfixturevalue(patient_fixture)
+        response = client.post("/api/simulate/batch", json={"patient": dict(patient), "actions": [1, 2, 3, 4]})
+        assert response.status_code == 200
+        bp_reductions = metric_reductions(response.json()["simulations"])
+
+        # More intensive treatments should have equal or greater effect, allowing a small margin
+        assert np.all(
+            np.diff(bp_reductions) >= -1
+        ), f"BP reductions for treatments 1-4 should not decrease, got {bp_reductions}"
 
 
 class TestAIRecommendationExplainability:
@@ -1018,64 +657,7 @@ class TestAIRecommendationExplainability:
     4. The system provides clear explanations for its recommendations
     """
 
-    @pytest.fixture
-    def healthy_patient(self):
-        """Low-risk patient"""
-        return {
-            "age": 45,
-            "sex": 1,
-            "cp": 1,
-            "trestbps": 110,
-            "chol": 180,
-            "fbs": 0,
-            "restecg": 0,
-            "thalach": 160,
-            "exang": 0,
-            "oldpeak": 0.0,
-            "slope": 1,
-            "ca": 0,
-            "thal": 3,
-        }
-
-    @pytest.fixture
-    def moderate_risk_patient(self):
-        """Moderate-risk patient"""
-        return {
-            "age": 55,
-            "sex": 1,
-            "cp": 3,
-            "trestbps": 150,
-            "chol": 250,
-            "fbs": 0,
-            "restecg": 0,
-            "thalach": 135,
-            "exang": 0,
-            "oldpeak": 1.5,
-            "slope": 2,
-            "ca": 1,
-            "thal": 3,
-        }
-
-    @pytest.fixture
-    def high_risk_patient(self):
-        """High-risk patient"""
-        return {
-            "age": 65,
-            "sex": 1,
-            "cp": 4,
-            "trestbps": 170,
-            "chol": 300,
-            "fbs": 1,
-            "restecg": 1,
-            "thalach": 110,
-            "exang": 1,
-            "oldpeak": 3.0,
-            "slope": 2,
-            "ca": 2,
-            "thal": 7,
-        }
-
-    def test_healthy_patient_gets_conservative_recommendation(self, client, healthy_patient):
+    def test_healthy_patient_gets_conservative_recommendation(self, recommend, healthy_patient):
         """
         Healthy patients should receive conservative recommendations.
 
@@ -1088,7 +670,7 @@ class TestAIRecommendationExplainability:
         Expected: AI should recommend action 0 (Monitor) or action 1 (Lifestyle)
         Not Expected: Actions 2-4 (medications) would be overtreatment
         """
-        response = client.post("/api/recommend", json=healthy_patient)
+        response = recommend(healthy_patient)
         assert response.status_code == 200
         data = response.json()
 
@@ -1106,7 +688,7 @@ class TestAIRecommendationExplainability:
         assert "rationale" in data, "Recommendation should include clinical rationale"
         assert len(data["rationale"]) > 0, "Rationale should not be empty"
 
-    def test_moderate_risk_patient_gets_balanced_recommendation(self, client, moderate_risk_patient):
+    def test_moderate_risk_patient_gets_balanced_recommendation(self, recommend, moderate_risk_patient):
         """
         Moderate-risk patients should receive balanced recommendations.
 
@@ -1120,7 +702,7 @@ class TestAIRecommendationExplainability:
         Expected: AI should recommend medication-based treatment (actions 2-4)
         Not Expected: Monitor only (insufficient for 70% risk)
         """
-        response = client.post("/api/recommend", json=moderate_risk_patient)
+        response = recommend(moderate_risk_patient)
         assert response.status_code == 200
         data = response.json()
 
@@ -1151,7 +733,7 @@ class TestAIRecommendationExplainability:
             or "risk" in rationale
         ), "Rationale should explain key risk factors"
 
-    def test_high_risk_patient_gets_intensive_recommendation(self, client, high_risk_patient):
+    def test_high_risk_patient_gets_intensive_recommendation(self, recommend, high_risk_patient):
         """
         High-risk patients should receive intensive recommendations.
 
@@ -1165,7 +747,7 @@ class TestAIRecommendationExplainability:
         Expected: AI should recommend action 3 (Combination) or action 4 (Intensive)
         Not Expected: Monitor, Lifestyle, or Single Med would be insufficient
         """
-        response = client.post("/api/recommend", json=high_risk_patient)
+        response = recommend(high_risk_patient)
         assert response.status_code == 200
         data = response.json()
 
@@ -1188,7 +770,7 @@ class TestAIRecommendationExplainability:
             keyword in rationale for keyword in ["high", "elevated", "severe", "multiple"]
         ), "Rationale should explain high-risk status"
 
-    def test_recommendation_explains_expected_benefits(self, client, moderate_risk_patient):
+    def test_recommendation_explains_expected_benefits(self, recommend, moderate_risk_patient):
         """
         Recommendations should explain expected benefits.
 
@@ -1199,7 +781,7 @@ class TestAIRecommendationExplainability:
 
         Expected: Response includes baseline_risk, and recommended option has new_risk and risk_reduction
         """
-        response = client.post("/api/recommend", json=moderate_risk_patient)
+        response = recommend(moderate_risk_patient)
         assert response.status_code == 200
         data = response.json()
 
@@ -1217,7 +799,7 @@ class TestAIRecommendationExplainability:
         # Expected final risk should be <= current risk (no paradoxical increases)
         assert recommended_option["new_risk"] <= data["baseline_risk"], "Intervention should not increase risk"
 
-    def test_recommendation_includes_treatment_details(self, client, moderate_risk_patient):
+    def test_recommendation_includes_treatment_details(self, recommend, moderate_risk_patient):
         """
         Recommendations should include actionable treatment details.
 
@@ -1228,7 +810,7 @@ class TestAIRecommendationExplainability:
 
         Expected: Response includes recommendation_name, recommendation_description, and recommended option has cost
         """
-        response = client.post("/api/recommend", json=moderate_risk_patient)
+        response = recommend(moderate_risk_patient)
         assert response.status_code == 200
         data = response.json()
 
@@ -1246,7 +828,7 @@ class TestAIRecommendationExplainability:
         assert len(data["recommendation_description"]) > 20, "Description should be detailed"
 
     def test_all_three_patient_types_get_different_recommendations(
-        self, client, healthy_patient, moderate_risk_patient, high_risk_patient
+        self, recommend, healthy_patient, moderate_risk_patient, high_risk_patient
     ):
         """
         Test that AI tailors recommendations to individual patient risk profiles.
@@ -1258,9 +840,9 @@ class TestAIRecommendationExplainability:
 
         Expected: Three different patients should generally get different recommendation levels
         """
-        healthy_response = client.post("/api/recommend", json=healthy_patient)
-        moderate_response = client.post("/api/recommend", json=moderate_risk_patient)
-        high_risk_response = client.post("/api/recommend", json=high_risk_patient)
+        healthy_response = recommend(healthy_patient)
+        moderate_response = recommend(moderate_risk_patient)
+        high_risk_response = recommend(high_risk_patient)
 
         healthy_data = healthy_response.json()
         moderate_data = moderate_response.json()
@@ -1289,57 +871,19 @@ class TestAIRecommendationExplainability:
 class TestInterventionConsistency:
     """Test that interventions produce consistent, reproducible results"""
 
-    @pytest.fixture
-    def sample_patient(self):
-        """Sample patient data"""
-        return {
-            "age": 55,
-            "sex": 1,
-            "cp": 2,
-            "trestbps": 145,
-            "chol": 240,
-            "fbs": 0,
-            "restecg": 0,
-            "thalach": 140,
-            "exang": 0,
-            "oldpeak": 1.0,
-            "slope": 2,
-            "ca": 1,
-            "thal": 3,  # thal must be 3, 6, or 7
-        }
-
     def test_same_input_produces_same_output(self, client, sample_patient):
         """Test that same patient + action produces consistent results"""
+        from api.main import simulate_cached
+
         response1 = client.post(
             "/api/simulate",
-            json={"patient": sample_patient, "action": 2},
+            json={"patient": dict(sample_patient), "action": 2},
         )
+        # Recompute rather than serve the memoised response, so determinism is actually checked
+        simulate_cached.cache_clear()
         response2 = client.post(
             "/api/simulate",
-            json={"patient": sample_patient, "action": 2},
+            json={"patient": dict(sample_patient), "action": 2},
         )
 
         assert response1.json() == response2.json()
-
-    def test_intervention_intensity_ordering(self, client, sample_patient):
-        """Test that more intensive interventions produce stronger effects"""
-        results = []
-        for action in range(1, 5):  # Lifestyle through Intensive
-            response = client.post(
-                "/api/simulate",
-                json={"patient": sample_patient, "action": action},
-            )
-            results.append(response.json())
-
-        # More intensive interventions should produce:
-        # 1. Equal or greater BP reductions
-        # 2. Equal or greater risk reductions
-        for i in range(len(results) - 1):
-            current = results[i]
-            next_level = results[i + 1]
-
-            bp_reduction_current = current["current_metrics"]["trestbps"] - current["optimized_metrics"]["trestbps"]
-            bp_reduction_next = next_level["current_metrics"]["trestbps"] - next_level["optimized_metrics"]["trestbps"]
-
-            # More intensive should have equal or greater effect
-            assert bp_reduction_next >= bp_reduction_current - 1  # Allow small margin
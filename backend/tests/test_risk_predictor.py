@@ -9,8 +9,9 @@ Tests cover:
 - Model persistence (save/load)
 """
 
-import tempfile
+import io
 from pathlib import Path
+from uuid import uuid4
 
 import numpy as np
 import pandas as pd
@@ -18,58 +19,93 @@ import pytest
 
 from ml.risk_predictor import RiskPredictor
 
+# Thalassemia codes, indexed by a drawn category
+THAL_VALUES = np.array([3, 6, 7])
 
-@pytest.fixture
+# Keys every predict() result and train()/evaluate() metrics dict must contain
+PREDICTION_KEYS = frozenset({"risk_score", "has_disease", "classification", "probability", "feature_importance"})
+METRIC_KEYS = frozenset({"accuracy", "precision", "recall", "f1", "roc_auc"})
+
+
+@pytest.fixture(scope="module")
 def sample_data():
     """
     Create sample training data for testing.
+
+    Module-scoped: the features are split off the target once and no test
+    modifies the returned frames.
     """
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     n_samples = 100
 
+    # Continuous measurements in one draw: age, trestbps, chol, thalach, oldpeak
+    age, trestbps, chol, thalach, oldpeak = rng.uniform(
+        low=[30, 90, 100, 60, 0], high=[80, 200, 400, 200, 6], size=(n_samples, 5)
+    ).T
+
+    # Categorical codes in one draw: sex, cp, fbs, restecg, exang, slope, ca, thal index, target
+    sex, cp, fbs, restecg, exang, slope, ca, thal_index, target = rng.integers(
+        low=[0, 1, 0, 0, 0, 1, 0, 0, 0], high=[2, 5, 2, 3, 2, 4, 4, 3, 2], size=(n_samples, 9), dtype=np.int8
+    ).T
+
     # Create synthetic patient data
     data = {
-        "age": np.random.uniform(30, 80, n_samples),
-        "sex": np.random.randint(0, 2, n_samples),
-        "cp": np.random.randint(1, 5, n_samples),
-        "trestbps": np.random.uniform(90, 200, n_samples),
-        "chol": np.random.uniform(100, 400, n_samples),
-        "fbs": np.random.randint(0, 2, n_samples),
-        "restecg": np.random.randint(0, 3, n_samples),
-        "thalach": np.random.uniform(60, 200, n_samples),
-        "exang": np.random.randint(0, 2, n_samples),
-        "oldpeak": np.random.uniform(0, 6, n_samples),
-        "slope": np.random.randint(1, 4, n_samples),
-        "ca": np.random.randint(0, 4, n_samples),
-        "thal": np.random.choice([3, 6, 7], n_samples),
-        "target": np.random.randint(0, 2, n_samples),
+        "age": age,
+        "sex": sex,
+        "cp": cp,
+        "trestbps": trestbps,
+        "chol": chol,
+        "fbs": fbs,
+        "restecg": restecg,
+        "thalach": thalach,
+        "exang": exang,
+        "oldpeak": oldpeak,
+        "slope": slope,
+        "ca": ca,
+        "thal": THAL_VALUES[thal_index],
+        "target": target,
     }
 
     df = pd.DataFrame(data)
 
-    # Normalize features (simple min-max for testing)
+    # Normalize features (simple min-max for testing), as float32: values are in [0, 1]
     features = df.drop("target", axis=1)
     target = df["target"]
 
-    features_normalized = (features - features.min()) / (features.max() - features.min())
+    values = features.to_numpy(dtype=np.float32)
+    features_normalized = pd.DataFrame(
+        (values - values.min(axis=0)) / np.ptp(values, axis=0), columns=features.columns, index=features.index
+    )
 
     return features_normalized, target
 
 
-@pytest.fixture
-def trained_predictor(sample_data):
+@pytest.fixture(scope="module")
+def single_patient(sample_data):
+    """First sample patient as a one-row DataFrame, sliced once per module"""
+    X, _ = sample_data
+    return X.iloc[[0]]
+
+
+@pytest.fixture(scope="module")
+def split_data(sample_data):
+    """80/20 train/validation split of sample_data as (X_train, X_val, y_train, y_val), sliced once per module"""
+    X, y = sample_data
+    split_idx = int(len(X) * 0.8)
+    return X.iloc[:split_idx], X.iloc[split_idx:], y.iloc[:split_idx], y.iloc[split_idx:]
+
+
+@pytest.fixture(scope="module")
+def trained_predictor(split_data):
     """
     Create a trained RiskPredictor for testing.
-    """
-    X, y = sample_data
 
-    # Split into train and validation sets
-    split_idx = int(len(X) * 0.8)
-    X_train, X_val = X.iloc[:split_idx], X.iloc[split_idx:]
-    y_train, y_val = y.iloc[:split_idx], y.iloc[split_idx:]
+    Trained once per module; tests only predict with, evaluate or save it.
+    """
+    X_train, X_val, y_train, y_val = split_data
 
     predictor = RiskPredictor(random_state=42)
-    predictor.train(X_train, y_train, X_val, y_val)
+    predictor.train(X_train, y_train, X_val, y_val, skip_cv=True)
 
     return predictor
 
@@ -100,24 +136,15 @@ class TestRiskPredictorInitialization:
 class TestRiskPredictorTraining:
     """Test model training"""
 
-    def test_train_basic(self, sample_data):
+    def test_train_basic(self, split_data):
         """Test basic training workflow"""
-        X, y = sample_data
-        split_idx = int(len(X) * 0.8)
-        X_train, X_val = X.iloc[:split_idx], X.iloc[split_idx:]
-        y_train, y_val = y.iloc[:split_idx], y.iloc[split_idx:]
+        X_train, X_val, y_train, y_val = split_data
 
         predictor = RiskPredictor(random_state=42)
         metrics = predictor.train(X_train, y_train, X_val, y_val)
 
         # Check that metrics are returned
-        assert "accuracy" in metrics
-        assert "precision" in metrics
-        assert "recall" in metrics
-        assert "f1" in metrics
-        assert "roc_auc" in metrics
-        assert "cv_accuracy_mean" in metrics
-        assert "cv_accuracy_std" in metrics
+        assert METRIC_KEYS | {"cv_accuracy_mean", "cv_accuracy_std"} <= metrics.keys()
 
         # Check that metrics are reasonable
         assert 0 <= metrics["accuracy"] <= 1
@@ -127,18 +154,27 @@ class TestRiskPredictorTraining:
         assert predictor.feature_names is not None
         assert len(predictor.feature_names) == 13
 
-    def test_train_mismatched_lengths(self, sample_data):
+    def test_train_skip_cv(self, split_data):
+        """Test that skip_cv trains the model without cross-validation metrics"""
+        X_train, X_val, y_train, y_val = split_data
+
+        predictor = RiskPredictor(random_state=42)
+        metrics = predictor.train(X_train, y_train, X_val, y_val, skip_cv=True)
+
+        assert METRIC_KEYS <= metrics.keys()
+        assert "cv_accuracy_mean" not in metrics
+        assert "cv_accuracy_std" not in metrics
+        assert hasattr(predictor.model, "classes_")
+
+    def test_train_mismatched_lengths(self, split_data):
         """Test that training fails with mismatched data lengths"""
-        X, y = sample_data
-        split_idx = int(len(X) * 0.8)
-        X_train, X_val = X.iloc[:split_idx], X.iloc[split_idx:]
-        y_train = y.iloc[:split_idx]
+        X_train, X_val, y_train, y_val = split_data
 
         predictor = RiskPredictor()
 
         # Mismatch training data
         with pytest.raises(ValueError, match="must have same length"):
-            predictor.train(X_train.iloc[:-5], y_train, X_val, y.iloc[split_idx:])
+            predictor.train(X_train.iloc[:-5], y_train, X_val, y_val)
 
     def test_feature_names_stored(self, trained_predictor):
         """Test that feature names are stored after training"""
@@ -151,19 +187,12 @@ class TestRiskPredictorTraining:
 class TestRiskPredictorPrediction:
     """Test prediction functionality"""
 
-    def test_predict_single_patient(self, trained_predictor, sample_data):
+    def test_predict_single_patient(self, trained_predictor, single_patient):
         """Test prediction on a single patient"""
-        X, _ = sample_data
-        patient = X.iloc[[0]]
-
-        result = trained_predictor.predict(patient)
+        result = trained_predictor.predict(single_patient)
 
         # Check result structure
-        assert "risk_score" in result
-        assert "has_disease" in result
-        assert "classification" in result
-        assert "probability" in result
-        assert "feature_importance" in result
+        assert PREDICTION_KEYS <= result.keys()
 
         # Check value ranges
         assert 0 <= result["risk_score"] <= 100
@@ -175,14 +204,11 @@ class TestRiskPredictorPrediction:
         assert isinstance(result["feature_importance"], dict)
         assert len(result["feature_importance"]) == 13
 
-    def test_predict_risk_classification(self, trained_predictor, sample_data):
+    def test_predict_risk_classification(self, trained_predictor, single_patient):
         """Test risk classification thresholds"""
-        X, _ = sample_data
-
         # We can't control the exact risk score, but we can check the logic
         # by testing the classification mapping
-        patient = X.iloc[[0]]
-        result = trained_predictor.predict(patient)
+        result = trained_predictor.predict(single_patient)
 
         if result["risk_score"] < 30:
             assert result["classification"] == "Low Risk"
@@ -191,25 +217,41 @@ class TestRiskPredictorPrediction:
         else:
             assert result["classification"] == "High Risk"
 
-    def test_predict_before_training(self, sample_data):
+    def test_predict_before_training(self, single_patient):
         """Test that prediction fails before training"""
         predictor = RiskPredictor()
-        X, _ = sample_data
-        patient = X.iloc[[0]]
 
         with pytest.raises(ValueError, match="not been trained"):
-            predictor.predict(patient)
+            predictor.predict(single_patient)
 
-    def test_predict_feature_mismatch(self, trained_predictor, sample_data):
+    def test_predict_feature_mismatch(self, trained_predictor, single_patient):
         """Test that prediction fails with wrong features"""
-        X, _ = sample_data
-
         # Create data with wrong columns
-        wrong_patient = X.iloc[[0]].rename(columns={"age": "wrong_feature"})
+        wrong_patient = single_patient.rename(columns={"age": "wrong_feature"})
 
         with pytest.raises(ValueError, match="Feature mismatch"):
             trained_predictor.predict(wrong_patient)
 
+    def test_has_disease_matches_model_predict(self, trained_predictor, sample_data):
+        """Test that has_disease, derived from the probabilities, equals the model's class prediction"""
+        X, _ = sample_data
+        patients = X.iloc[:10]
+
+        expected = trained_predictor.model.predict(patients)
+        has_disease = [trained_predictor.predict(patients.iloc[[i]])["has_disease"] for i in range(len(patients))]
+
+        assert has_disease == expected.astype(bool).tolist()
+
+    def test_predict_risk_scores_matches_predict(self, trained_predictor, sample_data):
+        """Test that batch risk scores equal the per-patient risk scores, in row order"""
+        X, _ = sample_data
+        patients = X.iloc[:5]
+
+        scores = trained_predictor.predict_risk_scores(patients)
+
+        expected = [trained_predictor.predict(patients.iloc[[i]])["risk_score"] for i in range(len(patients))]
+        np.testing.assert_allclose(scores, expected)
+
 
 class TestRiskPredictorEvaluation:
     """Test model evaluation"""
@@ -226,11 +268,7 @@ class TestRiskPredictorEvaluation:
         metrics = trained_predictor.evaluate(X_test, y_test)
 
         # Check metrics are returned
-        assert "accuracy" in metrics
-        assert "precision" in metrics
-        assert "recall" in metrics
-        assert "f1" in metrics
-        assert "roc_auc" in metrics
+        assert METRIC_KEYS <= metrics.keys()
 
         # Check metrics are in valid range
         assert 0 <= metrics["accuracy"] <= 1
@@ -268,11 +306,12 @@ class TestRiskPredictorFeatureImportance:
         assert len(importance_df) == 13
 
         # Check that importances are positive and sum to ~1
-        assert (importance_df["importance"] >= 0).all()
-        assert 0.9 < importance_df["importance"].sum() <= 1.1  # Allow some floating point error
+        importances = importance_df["importance"].to_numpy()
+        assert np.all(importances >= 0)
+        assert 0.9 < importances.sum() <= 1.1  # Allow some floating point error
 
         # Check that features are sorted by importance
-        assert importance_df["importance"].is_monotonic_decreasing
+        assert np.all(np.diff(importances) <= 0)
 
     def test_feature_importance_before_training(self):
         """Test that feature importance fails before training"""
@@ -285,42 +324,48 @@ class TestRiskPredictorFeatureImportance:
 class TestRiskPredictorPersistence:
     """Test model save/load functionality"""
 
-    def test_save_and_load(self, trained_predictor, sample_data):
+    def test_save_and_load(self, trained_predictor, single_patient, tmp_model_dir):
         """Test saving and loading model"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            model_path = Path(tmpdir) / "test_model.pkl"
+        model_path = tmp_model_dir / f"test_model_{uuid4().hex}.pkl"
+
+        # Save model
+        trained_predictor.save(model_path)
+        assert model_path.exists()
 
-            # Save model
-            trained_predictor.save(model_path)
-            assert model_path.exists()
+        # Load model into new instance
+        new_predictor = RiskPredictor()
+        new_predictor.load(model_path)
 
-            # Load model into new instance
-            new_predictor = RiskPredictor()
-            new_predictor.load(model_path)
+        # Check that parameters are restored
+        assert new_predictor.random_state == trained_predictor.random_state
+        assert new_predictor.feature_names == trained_predictor.feature_names
 
-            # Check that parameters are restored
-            assert new_predictor.random_state == trained_predictor.random_state
-            assert new_predictor.feature_names == trained_predictor.feature_names
+        # Check that predictions match
+        result_original = trained_predictor.predict(single_patient)
+        result_loaded = new_predictor.predict(single_patient)
 
-            # Check that predictions match
-            X, _ = sample_data
-            patient = X.iloc[[0]]
+        assert result_original["risk_score"] == result_loaded["risk_score"]
+        assert result_original["has_disease"] == result_loaded["has_disease"]
 
-            result_original = trained_predictor.predict(patient)
-            result_loaded = new_predictor.predict(patient)
+    def test_save_and_load_file_object(self, trained_predictor, single_patient):
+        """Test saving and loading model through an in-memory buffer"""
+        buffer = io.BytesIO()
+        trained_predictor.save(buffer)
+        buffer.seek(0)
 
-            assert result_original["risk_score"] == result_loaded["risk_score"]
-            assert result_original["has_disease"] == result_loaded["has_disease"]
+        new_predictor = RiskPredictor()
+        new_predictor.load(buffer)
 
-    def test_save_before_training(self):
+        assert new_predictor.feature_names == trained_predictor.feature_names
+        assert new_predictor.predict(single_patient)["risk_score"] == trained_predictor.predict(single_patient)["risk_score"]
+
+    def test_save_before_training(self, tmp_model_dir):
         """Test that save fails before training"""
         predictor = RiskPredictor()
+        model_path = tmp_model_dir / f"test_model_{uuid4().hex}.pkl"
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            model_path = Path(tmpdir) / "test_model.pkl"
-
-            with pytest.raises(ValueError, match="not been trained"):
-                predictor.save(model_path)
+        with pytest.raises(ValueError, match="not been trained"):
+            predictor.save(model_path)
 
     def test_load_nonexistent_file(self):
         """Test that load fails with non-existent file"""
@@ -333,33 +378,25 @@ class TestRiskPredictorPersistence:
 class TestRiskPredictorEdgeCases:
     """Test edge cases and error handling"""
 
-    def test_prediction_consistency(self, trained_predictor, sample_data):
+    def test_prediction_consistency(self, trained_predictor, single_patient):
         """Test that predictions are consistent (deterministic)"""
-        X, _ = sample_data
-        patient = X.iloc[[0]]
-
-        result1 = trained_predictor.predict(patient)
-        result2 = trained_predictor.predict(patient)
+        result1 = trained_predictor.predict(single_patient)
+        result2 = trained_predictor.predict(single_patient)
 
         assert result1["risk_score"] == result2["risk_score"]
         assert result1["has_disease"] == result2["has_disease"]
 
     def test_multiple_predictions(self, trained_predictor, sample_data):
-        """Test predicting on multiple patients sequentially"""
+        """Test predicting on multiple patients in one call"""
         X, _ = sample_data
 
-        results = []
-        for i in range(5):
-            patient = X.iloc[[i]]
-            result = trained_predictor.predict(patient)
-            results.append(result)
+        risk_scores = trained_predictor.predict_risk_scores(X.iloc[:5])
 
-        # Check that we got 5 different predictions
-        assert len(results) == 5
+        # Check that we got 5 predictions
+        assert len(risk_scores) == 5
 
         # Results should vary (very unlikely to be all identical)
-        risk_scores = [r["risk_score"] for r in results]
-        assert len(set(risk_scores)) > 1
+        assert np.ptp(risk_scores) > 0
 
 
 if __name__ == "__main__":
@@ -11,26 +11,35 @@ This test suite validates that:
 These tests encode clinical expectations about intervention effectiveness.
 """
 
+from types import MappingProxyType
+
 import joblib
 import pandas as pd
 import pytest
 
 from api.config import get_settings
-from ml.intervention_utils import apply_intervention_effects
-from ml.risk_predictor import RiskPredictor
+from ml.intervention_utils import apply_intervention_effects_batch
+
+
+@pytest.fixture(scope="module")
+def predictor_and_scaler(trained_risk_predictor):
+    """Risk predictor, shared with other modules through the session fixture, and scaler."""
+    scaler = joblib.load(get_settings().scaler_path)
+    return trained_risk_predictor, scaler
 
 
 @pytest.fixture(scope="module")
-def predictor_and_scaler():
-    """Load risk predictor and scaler."""
-    settings = get_settings()
-    model = RiskPredictor()
-    model.load(settings.risk_predictor_path)
-    scaler = joblib.load(settings.scaler_path)
-    return model, scaler
+def top_features(predictor_and_scaler):
+    """Names of the model's five most important features, computed once per module."""
+    predictor, _ = predictor_and_scaler
+    return predictor.get_feature_importance()["feature"].head(5).tolist()
 
 
-@pytest.fixture
+# Patient profiles are module-scoped and read-only: each is built once and shared by every test.
+# They differ from the conftest.py profiles of the same name, which they override here.
+
+
+@pytest.fixture(scope="module")
 def healthy_patient():
     """
     Healthy patient profile with optimal metrics.
@@ -46,24 +55,26 @@ def healthy_patient():
 
     Expected risk: LOW (<10%)
     """
-    return {
-        "age": 35.0,
-        "sex": 0,
-        "cp": 1,  # Typical angina
-        "trestbps": 110.0,  # Optimal BP
-        "chol": 180.0,  # Optimal cholesterol
-        "fbs": 0,
-        "restecg": 0,
-        "thalach": 170.0,  # Good max heart rate
-        "exang": 0,  # No exercise-induced angina
-        "oldpeak": 0.0,  # No ST depression
-        "slope": 1,
-        "ca": 0,  # No diseased vessels
-        "thal": 3,  # Normal
-    }
+    return MappingProxyType(
+        {
+            "age": 35.0,
+            "sex": 0,
+            "cp": 1,  # Typical angina
+            "trestbps": 110.0,  # Optimal BP
+            "chol": 180.0,  # Optimal cholesterol
+            "fbs": 0,
+            "restecg": 0,
+            "thalach": 170.0,  # Good max heart rate
+            "exang": 0,  # No exercise-induced angina
+            "oldpeak": 0.0,  # No ST depression
+            "slope": 1,
+            "ca": 0,  # No diseased vessels
+            "thal": 3,  # Normal
+        }
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def moderate_risk_patient():
     """
     Moderate risk patient with some elevated metrics.
@@ -79,24 +90,26 @@ def moderate_risk_patient():
 
     Expected risk: MEDIUM (30-70%)
     """
-    return {
-        "age": 55.0,
-        "sex": 1,
-        "cp": 2,  # Atypical angina
-        "trestbps": 145.0,  # Moderately elevated BP
-        "chol": 240.0,  # Moderately high cholesterol
-        "fbs": 0,
-        "restecg": 0,
-        "thalach": 145.0,  # Moderate max heart rate
-        "exang": 0,
-        "oldpeak": 1.5,  # Moderate ST depression
-        "slope": 2,
-        "ca": 1,  # One diseased vessel
-        "thal": 6,  # Fixed defect
-    }
+    return MappingProxyType(
+        {
+            "age": 55.0,
+            "sex": 1,
+            "cp": 2,  # Atypical angina
+            "trestbps": 145.0,  # Moderately elevated BP
+            "chol": 240.0,  # Moderately high cholesterol
+            "fbs": 0,
+            "restecg": 0,
+            "thalach": 145.0,  # Moderate max heart rate
+            "exang": 0,
+            "oldpeak": 1.5,  # Moderate ST depression
+            "slope": 2,
+            "ca": 1,  # One diseased vessel
+            "thal": 6,  # Fixed defect
+        }
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def high_risk_patient():
     """
     High risk patient with multiple severe risk factors.
@@ -118,21 +131,23 @@ def high_risk_patient():
     large improvements in modifiable metrics (BP, cholesterol), the absolute
     risk reduction will be limited by these structural factors.
     """
-    return {
-        "age": 70.0,
-        "sex": 1,
-        "cp": 4,  # Asymptomatic (most severe)
-        "trestbps": 180.0,  # Severe hypertension
-        "chol": 300.0,  # High cholesterol
-        "fbs": 1,
-        "restecg": 2,
-        "thalach": 100.0,  # Low max heart rate
-        "exang": 1,  # Exercise-induced angina
-        "oldpeak": 4.0,  # Severe ST depression
-        "slope": 3,
-        "ca": 3,  # Three diseased vessels (NON-MODIFIABLE)
-        "thal": 7,  # Reversible defect (NON-MODIFIABLE)
-    }
+    return MappingProxyType(
+        {
+            "age": 70.0,
+            "sex": 1,
+            "cp": 4,  # Asymptomatic (most severe)
+            "trestbps": 180.0,  # Severe hypertension
+            "chol": 300.0,  # High cholesterol
+            "fbs": 1,
+            "restecg": 2,
+            "thalach": 100.0,  # Low max heart rate
+            "exang": 1,  # Exercise-induced angina
+            "oldpeak": 4.0,  # Severe ST depression
+            "slope": 3,
+            "ca": 3,  # Three diseased vessels (NON-MODIFIABLE)
+            "thal": 7,  # Reversible defect (NON-MODIFIABLE)
+        }
+    )
 
 
 def get_risk_prediction(patient_data, predictor, scaler):
@@ -146,34 +161,46 @@ def get_risk_prediction(patient_data, predictor, scaler):
     return prediction["risk_score"]
 
 
-def analyze_intervention(patient_data, action, predictor, scaler):
-    """Analyze intervention effects on a patient."""
-    # Get current risk
-    current_risk = get_risk_prediction(patient_data, predictor, scaler)
+def analyze_interventions(patient_data, actions, predictor, scaler):
+    """Analyze several interventions on a patient, scoring them all in one model call.
 
-    # Apply intervention to raw data
-    patient_df = pd.DataFrame([patient_data])
-    modified_df = apply_intervention_effects(patient_df, action)
-    modified_data = modified_df.iloc[0].to_dict()
+    Returns a dict mapping each action to its analysis.
+    """
+    # One copy of the raw data per action, after a leading Monitor Only (unchanged) row as the baseline.
+    # Copies keep the same index label, which seeds the deterministic exang outcome.
+    patient_rows = pd.DataFrame([patient_data]).loc[[0] * (len(actions) + 1)]
+    modified_df = apply_intervention_effects_batch(patient_rows, [0, *actions])
 
-    # Get new risk
-    new_risk = get_risk_prediction(modified_data, predictor, scaler)
+    # Score the current patient and every modified patient together
+    risks = predictor.predict_risk_scores(modified_df)
+    current_risk = risks[0]
 
     # Calculate changes
-    risk_reduction = current_risk - new_risk
-    bp_change = patient_data["trestbps"] - modified_data["trestbps"]
-    chol_change = patient_data["chol"] - modified_data["chol"]
+    risk_reductions = current_risk - risks
+    bp_changes = patient_data["trestbps"] - modified_df["trestbps"].to_numpy()
+    chol_changes = patient_data["chol"] - modified_df["chol"].to_numpy()
 
     return {
-        "current_risk": current_risk,
-        "new_risk": new_risk,
-        "risk_reduction": risk_reduction,
-        "bp_change": bp_change,
-        "chol_change": chol_change,
-        "modified_data": modified_data,
+        action: {
+            "current_risk": current_risk,
+            "new_risk": risks[i],
+            "risk_reduction": risk_reductions[i],
+            "bp_change": bp_changes[i],
+            "chol_change": chol_changes[i],
+            "modified_df": modified_df.iloc[[i]],
+        }
+        for i, action in enumerate(actions, start=1)
     }
 
 
+@pytest.fixture(scope="module")
+def intervention(predictor_and_scaler, memoize):
+    """Analyze an action on a patient, batching all five actions per patient and memoising them for the module."""
+    predictor, scaler = predictor_and_scaler
+    analyze_all = memoize(lambda patient: analyze_interventions(patient, list(range(5)), predictor=predictor, scaler=scaler))
+    return lambda patient, action: analyze_all(patient)[action]
+
+
 class TestHealthyPatientDiminishingReturns:
     """
     Test that healthy patients show appropriate diminishing returns.
@@ -193,35 +220,29 @@ class TestHealthyPatientDiminishingReturns:
         risk = get_risk_prediction(healthy_patient, predictor, scaler)
         assert risk < 10, f"Healthy patient should have risk <10%, got {risk:.1f}%"
 
-    def test_healthy_patient_minimal_metric_changes(self, healthy_patient, predictor_and_scaler):
+    def test_healthy_patient_minimal_metric_changes(self, healthy_patient, intervention):
         """Healthy patient should see minimal metric changes from interventions."""
-        predictor, scaler = predictor_and_scaler
         # Test intensive treatment (strongest intervention)
-        result = analyze_intervention(healthy_patient, action=4, predictor=predictor, scaler=scaler)
+        result = intervention(healthy_patient, 4)
 
         # Metrics should change very little (already optimal)
         assert result["bp_change"] < 5, f"Healthy patient BP should change <5 mmHg, got {result['bp_change']:.1f}"
         assert result["chol_change"] < 10, f"Healthy patient chol should change <10 mg/dL, got {result['chol_change']:.1f}"
 
-    def test_healthy_patient_minimal_risk_reduction(self, healthy_patient, predictor_and_scaler):
-        """Healthy patient should see minimal risk reduction (already low risk)."""
-        predictor, scaler = predictor_and_scaler
-
-        # Test all active interventions (1-4)
-        for action in range(1, 5):
-            result = analyze_intervention(healthy_patient, action=action, predictor=predictor, scaler=scaler)
+    @pytest.mark.parametrize("action", [1, 2, 3, 4])
+    def test_healthy_patient_minimal_risk_reduction(self, healthy_patient, intervention, action):
+        """Healthy patient should see minimal risk reduction (already low risk) from each active intervention."""
+        result = intervention(healthy_patient, action)
 
-            # Risk reduction should be minimal (< 5% absolute)
-            assert (
-                result["risk_reduction"] < 5
-            ), f"Healthy patient should have <5% risk reduction with action {action}, got {result['risk_reduction']:.1f}%"
+        # Risk reduction should be minimal (< 5% absolute)
+        assert (
+            result["risk_reduction"] < 5
+        ), f"Healthy patient should have <5% risk reduction with action {action}, got {result['risk_reduction']:.1f}%"
 
-    def test_intensive_treatment_not_justified_for_healthy(self, healthy_patient, predictor_and_scaler):
+    def test_intensive_treatment_not_justified_for_healthy(self, healthy_patient, intervention):
         """Intensive treatment (high cost) should not provide significant benefit to healthy patients."""
-        predictor, scaler = predictor_and_scaler
-
-        lifestyle = analyze_intervention(healthy_patient, action=1, predictor=predictor, scaler=scaler)
-        intensive = analyze_intervention(healthy_patient, action=4, predictor=predictor, scaler=scaler)
+        lifestyle = intervention(healthy_patient, 1)
+        intensive = intervention(healthy_patient, 4)
 
         # Intensive treatment should not be significantly better than lifestyle
         # (Cost-benefit: intensive costs 4x more but provides similar benefit)
@@ -250,36 +271,30 @@ class TestModerateRiskPatientBenefit:
         # Note: Even one diseased vessel significantly increases risk
         assert 30 <= risk <= 90, f"Moderate patient should have risk 30-90%, got {risk:.1f}%"
 
-    def test_moderate_patient_shows_metric_improvements(self, moderate_risk_patient, predictor_and_scaler):
+    def test_moderate_patient_shows_metric_improvements(self, moderate_risk_patient, intervention):
         """Moderate risk patient should show measurable metric improvements."""
-        predictor, scaler = predictor_and_scaler
-
         # Test intensive treatment
-        result = analyze_intervention(moderate_risk_patient, action=4, predictor=predictor, scaler=scaler)
+        result = intervention(moderate_risk_patient, 4)
 
         # Should see meaningful metric changes
         assert result["bp_change"] > 10, f"Moderate patient BP should reduce >10 mmHg, got {result['bp_change']:.1f}"
         assert result["chol_change"] > 30, f"Moderate patient chol should reduce >30 mg/dL, got {result['chol_change']:.1f}"
 
-    def test_moderate_patient_shows_risk_reduction(self, moderate_risk_patient, predictor_and_scaler):
+    def test_moderate_patient_shows_risk_reduction(self, moderate_risk_patient, intervention):
         """Moderate risk patient should show meaningful risk reduction."""
-        predictor, scaler = predictor_and_scaler
-
         # Test combination therapy
-        result = analyze_intervention(moderate_risk_patient, action=3, predictor=predictor, scaler=scaler)
+        result = intervention(moderate_risk_patient, 3)
 
         # Should see meaningful risk reduction (5-20% absolute)
         assert (
             5 <= result["risk_reduction"] <= 20
         ), f"Moderate patient should have 5-20% risk reduction, got {result['risk_reduction']:.1f}%"
 
-    def test_moderate_patient_progressive_benefit(self, moderate_risk_patient, predictor_and_scaler):
+    def test_moderate_patient_progressive_benefit(self, moderate_risk_patient, intervention):
         """More intensive interventions should provide progressively more benefit."""
-        predictor, scaler = predictor_and_scaler
-
-        lifestyle = analyze_intervention(moderate_risk_patient, action=1, predictor=predictor, scaler=scaler)
-        medication = analyze_intervention(moderate_risk_patient, action=2, predictor=predictor, scaler=scaler)
-        intensive = analyze_intervention(moderate_risk_patient, action=4, predictor=predictor, scaler=scaler)
+        lifestyle = intervention(moderate_risk_patient, 1)
+        medication = intervention(moderate_risk_patient, 2)
+        intensive = intervention(moderate_risk_patient, 4)
 
         # More intensive = more reduction (allowing for some model variance)
         assert (
@@ -312,18 +327,16 @@ class TestHighRiskPatientStructuralLimitations:
         risk = get_risk_prediction(high_risk_patient, predictor, scaler)
         assert risk > 70, f"High risk patient should have risk >70%, got {risk:.1f}%"
 
-    def test_high_risk_patient_shows_large_metric_improvements(self, high_risk_patient, predictor_and_scaler):
+    def test_high_risk_patient_shows_large_metric_improvements(self, high_risk_patient, intervention):
         """High risk patient should show large metric improvements (lots of room)."""
-        predictor, scaler = predictor_and_scaler
-
         # Test intensive treatment
-        result = analyze_intervention(high_risk_patient, action=4, predictor=predictor, scaler=scaler)
+        result = intervention(high_risk_patient, 4)
 
         # Should see large metric changes (started very elevated)
         assert result["bp_change"] > 30, f"High risk patient BP should reduce >30 mmHg, got {result['bp_change']:.1f}"
         assert result["chol_change"] > 50, f"High risk patient chol should reduce >50 mg/dL, got {result['chol_change']:.1f}"
 
-    def test_high_risk_patient_structural_factors_limit_reduction(self, high_risk_patient, predictor_and_scaler):
+    def test_high_risk_patient_structural_factors_limit_reduction(self, high_risk_patient, top_features, intervention):
         """
         High risk patient risk reduction is limited by structural factors.
 
@@ -334,19 +347,11 @@ class TestHighRiskPatientStructuralLimitations:
 
         This is clinically realistic and appropriate.
         """
-        predictor, scaler = predictor_and_scaler
-
-        # Check that structural factors are indeed important
-        feature_importance = predictor.get_feature_importance()
-        importance_dict = dict(zip(feature_importance["feature"], feature_importance["importance"]))
-
         # ca and thal should be in top 5 most important features
-        sorted_features = sorted(importance_dict.items(), key=lambda x: x[1], reverse=True)
-        top_5_features = [f[0] for f in sorted_features[:5]]
-        assert "ca" in top_5_features or "thal" in top_5_features, "Structural factors (ca, thal) should be highly important"
+        assert "ca" in top_features or "thal" in top_features, "Structural factors (ca, thal) should be highly important"
 
         # Despite large metric improvements, risk reduction will be limited
-        result = analyze_intervention(high_risk_patient, action=4, predictor=predictor, scaler=scaler)
+        result = intervention(high_risk_patient, 4)
 
         # Risk reduction will be modest (<15%) despite large metric changes
         # This is APPROPRIATE given structural factors
@@ -354,12 +359,10 @@ class TestHighRiskPatientStructuralLimitations:
             result["risk_reduction"] < 15
         ), f"High risk patient reduction should be <15% (structural limits), got {result['risk_reduction']:.1f}%"
 
-    def test_high_risk_patient_still_benefits_from_treatment(self, high_risk_patient, predictor_and_scaler):
+    def test_high_risk_patient_still_benefits_from_treatment(self, high_risk_patient, intervention):
         """High risk patient shows metric improvements even with limited risk reduction."""
-        predictor, scaler = predictor_and_scaler
-
         # Even with structural limitations, treatment improves metrics
-        result = analyze_intervention(high_risk_patient, action=4, predictor=predictor, scaler=scaler)
+        result = intervention(high_risk_patient, 4)
 
         # Risk reduction may be minimal (<1%) due to structural factors dominating
         # But risk should never increase
@@ -415,7 +418,7 @@ class TestInterventionIntensityCostBenefit:
         assert intensive["intensity"] == "Very High"
 
     def test_cost_benefit_pattern_across_risk_levels(
-        self, healthy_patient, moderate_risk_patient, high_risk_patient, predictor_and_scaler
+        self, healthy_patient, moderate_risk_patient, high_risk_patient, intervention
     ):
         """
         Test that cost-benefit pattern makes clinical sense.
@@ -426,11 +429,9 @@ class TestInterventionIntensityCostBenefit:
         - High Risk: Modest benefit (<10% reduction) → May or may not be justified
           (depends on patient values, treatment goals)
         """
-        predictor, scaler = predictor_and_scaler
-
-        healthy_result = analyze_intervention(healthy_patient, action=4, predictor=predictor, scaler=scaler)
-        moderate_result = analyze_intervention(moderate_risk_patient, action=4, predictor=predictor, scaler=scaler)
-        high_result = analyze_intervention(high_risk_patient, action=4, predictor=predictor, scaler=scaler)
+        healthy_result = intervention(healthy_patient, 4)
+        moderate_result = intervention(moderate_risk_patient, 4)
+        high_result = intervention(high_risk_patient, 4)
 
         # Healthy: No meaningful benefit
         assert healthy_result["risk_reduction"] < 2, "Intensive treatment should not benefit healthy patients significantly"
@@ -453,7 +454,7 @@ class TestInterventionIntensityCostBenefit:
             f"moderate={moderate_result['risk_reduction']:.1f}%, high={high_result['risk_reduction']:.1f}%"
         )
 
-    def test_relative_vs_absolute_risk_reduction(self, moderate_risk_patient, high_risk_patient, predictor_and_scaler):
+    def test_relative_vs_absolute_risk_reduction(self, moderate_risk_patient, high_risk_patient, intervention):
         """
         Test that we consider both relative and absolute risk reduction.
 
@@ -464,10 +465,8 @@ class TestInterventionIntensityCostBenefit:
 
         This is important for clinical decision-making.
         """
-        predictor, scaler = predictor_and_scaler
-
-        moderate_result = analyze_intervention(moderate_risk_patient, action=4, predictor=predictor, scaler=scaler)
-        high_result = analyze_intervention(high_risk_patient, action=4, predictor=predictor, scaler=scaler)
+        moderate_result = intervention(moderate_risk_patient, 4)
+        high_result = intervention(high_risk_patient, 4)
 
         # Calculate relative reduction
         moderate_relative = (moderate_result["risk_reduction"] / moderate_result["current_risk"]) * 100
@@ -484,31 +483,26 @@ class TestInterventionIntensityCostBenefit:
 class TestInterventionEffectsSanityChecks:
     """General sanity checks for intervention effects."""
 
-    def test_monitor_only_makes_no_changes(self, moderate_risk_patient, predictor_and_scaler):
+    def test_monitor_only_makes_no_changes(self, moderate_risk_patient, intervention):
         """Monitor Only (action 0) should make no changes."""
-        predictor, scaler = predictor_and_scaler
-        result = analyze_intervention(moderate_risk_patient, action=0, predictor=predictor, scaler=scaler)
+        result = intervention(moderate_risk_patient, 0)
 
         assert result["risk_reduction"] == 0, "Monitor Only should not change risk"
         assert result["bp_change"] == 0, "Monitor Only should not change BP"
         assert result["chol_change"] == 0, "Monitor Only should not change cholesterol"
 
-    def test_interventions_never_increase_risk(self, moderate_risk_patient, predictor_and_scaler):
+    @pytest.mark.parametrize("action", [0, 1, 2, 3, 4])
+    def test_interventions_never_increase_risk(self, moderate_risk_patient, intervention, action):
         """No intervention should ever increase risk (monotonicity)."""
-        predictor, scaler = predictor_and_scaler
-
-        for action in range(5):
-            result = analyze_intervention(moderate_risk_patient, action=action, predictor=predictor, scaler=scaler)
-            assert (
-                result["risk_reduction"] >= 0
-            ), f"Action {action} should not increase risk, got reduction {result['risk_reduction']:.1f}%"
+        result = intervention(moderate_risk_patient, action)
+        assert (
+            result["risk_reduction"] >= 0
+        ), f"Action {action} should not increase risk, got reduction {result['risk_reduction']:.1f}%"
 
-    def test_metric_changes_increase_with_intensity(self, moderate_risk_patient, predictor_and_scaler):
+    def test_metric_changes_increase_with_intensity(self, moderate_risk_patient, intervention):
         """More intensive interventions should produce larger metric changes."""
-        predictor, scaler = predictor_and_scaler
-
-        lifestyle = analyze_intervention(moderate_risk_patient, action=1, predictor=predictor, scaler=scaler)
-        intensive = analyze_intervention(moderate_risk_patient, action=4, predictor=predictor, scaler=scaler)
+        lifestyle = intervention(moderate_risk_patient, 1)
+        intensive = intervention(moderate_risk_patient, 4)
 
         # Intensive should change metrics more than lifestyle
         assert intensive["bp_change"] > lifestyle["bp_change"], "Intensive should reduce BP more than lifestyle"
@@ -516,4 +510,4 @@ class TestInterventionEffectsSanityChecks:
 
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v", "--tb=short"])
+    pytest.main([__file__, "-v", "--tb=line"])